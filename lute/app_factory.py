@@ -28,11 +28,15 @@ from lute.db import db
 from lute.db.setup.main import setup_db
 from lute.db.management import add_default_user_settings
 from lute.db.data_cleanup import clean_data
+from lute.read.render import multiword_registry
+from lute.read import page_cache
 from lute.backup.service import Service as BackupService
 from lute.db.demo import Service as DemoService
 import lute.utils.formutils
 
 from lute.parse.registry import init_parser_plugins, supported_parsers
+from lute.parse import warm_up as parser_warm_up
+from lute.parse import space_delimited_parser
 
 from lute.models.book import Book
 from lute.models.language import Language
@@ -58,6 +62,8 @@ from lute.useraudio.routes import bp as useraudio_bp
 from lute.termimport.routes import bp as termimport_bp
 from lute.backup.routes import bp as backup_bp
 from lute.dev_api.routes import bp as dev_api_bp
+from lute.instrumentation.routes import bp as instrumentation_bp
+from lute.instrumentation import profiling
 from lute.settings.routes import bp as settings_bp
 from lute.themes.routes import bp as themes_bp
 from lute.stats.routes import bp as stats_bp
@@ -105,6 +111,10 @@ def _setup_app_dirs(app_config):
             app_config.temppath,
             "Temp directory for export file writes, to avoid permissions issues.",
         ],
+        [
+            app_config.cachepath,
+            "Cached calculated data, e.g. default word characters.",
+        ],
     ]
     for rec in required_dirs:
         _setup_app_dir(rec[0], rec[1])
@@ -179,6 +189,8 @@ def _add_base_routes(app, app_config):
                 backup_warning_msg=warning_msg,
                 reading_streak=get_reading_streak(db.session),
                 show_streak_on_home=current_settings.get("show_streak_on_home", False),
+                parser_status=parser_warm_up.status(),
+                parsers_ready=parser_warm_up.all_ready(),
             )
         )
         return response
@@ -245,6 +257,13 @@ def _add_base_routes(app, app_config):
         }
         return jsonify(ret)
 
+    @app.route("/parser_status")
+    def parser_status():
+        "Json parser warm-up status and timings."
+        return jsonify(
+            {"ready": parser_warm_up.all_ready(), "parsers": parser_warm_up.status()}
+        )
+
     @app.route("/static/js/never_cache/<path:filename>")
     def custom_js(filename):
         """
@@ -311,6 +330,10 @@ def _create_app(app_config, extra_config):
         # ref https://stackoverflow.com/questions/5207160/
         #   what-is-a-csrf-token-what-is-its-importance-and-how-does-it-work
         "WTF_CSRF_ENABLED": False,
+        # Number of following pages to render in the background
+        # when a page is opened for reading.  Off for test dbs, as
+        # the background thread saves terms while tests run.
+        "PRERENDER_PAGES": 0 if app_config.is_test_db else 2,
     }
 
     final_config = {**config, **extra_config}
@@ -321,6 +344,11 @@ def _create_app(app_config, extra_config):
 
     db.init_app(app)
 
+    # The db may have been replaced (e.g. during tests), so
+    # any cached multiword indexes and pages are no longer valid.
+    multiword_registry.invalidate()
+    page_cache.invalidate()
+
     @listens_for(Pool, "connect")
     def _pragmas_on_connect(dbapi_con, con_record):  # pylint: disable=unused-argument
         dbapi_con.execute("pragma recursive_triggers = on;")
@@ -351,6 +379,12 @@ def _create_app(app_config, extra_config):
     app.register_blueprint(cli_bp)
     if app_config.is_test_db:
         app.register_blueprint(dev_api_bp)
+    if app_config.instrument_requests:
+        app.register_blueprint(instrumentation_bp)
+    if app_config.profile_threshold_ms is not None:
+        profiling.init_app(
+            app, app_config.profile_threshold_ms, app_config.profilespath
+        )
 
     return app
 
@@ -411,6 +445,7 @@ def create_app(
 
     app_config = AppConfig(app_config_path)
     _setup_app_dirs(app_config)
+    space_delimited_parser.WORD_CHARACTERS_CACHE_DIR = app_config.cachepath
     setup_db(app_config, output_func)
 
     if extra_config is None:
@@ -421,6 +456,11 @@ def create_app(
     # Plugins are loaded after the app, as they may use settings etc.
     _init_parser_plugins(app_config.plugin_datapath, outfunc)
 
+    # Only the parsers that are actually used need warming up.
+    with app.app_context():
+        parser_types = {r[0] for r in db.session.query(Language.parser_type)}
+    parser_warm_up.start(parser_types, outfunc)
+
     return app
 
 
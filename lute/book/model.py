@@ -8,6 +8,8 @@ from lute.models.repositories import (
     BookTagRepository,
     LanguageRepository,
 )
+from lute.parse.base import ParsedToken, number_tokens
+from lute.parse.parallel import parse_all
 
 
 def token_group_generator(tokens, group_type, threshold=500):
@@ -169,21 +171,60 @@ class Repository:
         return segments
 
     def _split_pages(self, book, language):
-        "Split fulltext into pages, respecting sentences."
+        """
+        Split fulltext into pages, respecting sentences.
+
+        Returns a list of (page text, tokens) pairs.  The fulltext
+        tokens are reused for the pages where possible (see
+        _page_tokens()), and the other pages are parsed.
+        """
 
         pages = []
-        for segment in self._split_text_at_page_breaks(book.text):
-            tokens = language.parser.get_parsed_tokens(segment, language)
+        segments = self._split_text_at_page_breaks(book.text)
+        for tokens in parse_all(language, segments):
             for toks in token_group_generator(
                 tokens, book.split_by, book.threshold_page_tokens
             ):
                 s = "".join([t.token for t in toks])
                 s = s.replace("\r", "").replace("¶", "\n")
-                pages.append(s.strip())
-        pages = [p for p in pages if p.strip() != ""]
+                page = s.strip()
+                if page != "":
+                    pages.append((page, self._page_tokens(toks, page)))
+
+        unparsed = [i for i, (_, toks) in enumerate(pages) if toks is None]
+        to_parse = [DBText.text_to_parse(pages[i][0]) for i in unparsed]
+        for i, toks in zip(unparsed, parse_all(language, to_parse)):
+            pages[i] = (pages[i][0], toks)
 
         return pages
 
+    def _page_tokens(self, toks, page):
+        """
+        The tokens of the page, taken from the group of fulltext
+        tokens it was built from, or None if they don't give exactly
+        the text that Text parses (e.g. the page has runs of spaces).
+        """
+        toks = list(toks)
+
+        def _is_space(t):
+            return not t.is_word and t.token.replace("¶", "\n").strip() == ""
+
+        while toks and _is_space(toks[0]):
+            toks.pop(0)
+        while toks and _is_space(toks[-1]):
+            toks.pop()
+        if not toks:
+            return None
+        for i, strip in [(0, str.lstrip), (-1, str.rstrip)]:
+            t = toks[i]
+            if not t.is_word:
+                toks[i] = ParsedToken(strip(t.token), False, t.is_end_of_sentence)
+
+        joined = "".join(t.token for t in toks).replace("¶", "\n")
+        if joined != page or DBText.text_to_parse(page) != page:
+            return None
+        return tuple(number_tokens(toks))
+
     def _build_db_book(self, book):
         "Convert a book business object to a DBBook."
 
@@ -201,8 +242,8 @@ class Repository:
         if book.id is None:
             pages = self._split_pages(book, lang)
             b = DBBook(book.title, lang)
-            for index, page in enumerate(pages):
-                _ = DBText(b, page, index + 1)
+            for index, (page, tokens) in enumerate(pages):
+                _ = DBText(b, page, index + 1, tokens)
         else:
             b = self.book_repo.find(book.id)
 
@@ -5,7 +5,7 @@ Book statistics.
 import json
 from sqlalchemy import select, text
 from lute.read.render.service import Service as RenderService
-from lute.models.book import Book, BookStats
+from lute.models.book import Book, BookStats, Text
 from lute.models.repositories import UserSettingRepository
 
 # from lute.utils.debug_helpers import DebugTimer
@@ -55,8 +55,12 @@ class Service:
         service = RenderService(self.session)
         mw = service.get_multiword_indexer(book.language)
         textitems = []
-        for tx in texts:
-            textitems.extend(service.get_textitems(tx.text, book.language, mw))
+        # Stats are calculated during requests, so no process pool.
+        all_tokens = Text.get_all_parsed_tokens(texts, use_pool=False)
+        for tx, tokens in zip(texts, all_tokens):
+            textitems.extend(
+                service.get_textitems(tx.text, book.language, mw, tokens=tokens)
+            )
         # # Old slower code:
         # text_sample = "\n".join([t.text for t in texts])
         # paras = get_paragraphs(text_sample, book.language) ... etc.
@@ -38,6 +38,13 @@ class AppConfig:  # pylint: disable=too-many-instance-attributes
 
         self.is_docker = bool(config.get("IS_DOCKER", False))
 
+        # Record per-request sql and timing data.
+        self.instrument_requests = bool(config.get("INSTRUMENT_REQUESTS", False))
+
+        # Profile parsing and rendering, saving profiles of requests
+        # slower than this many ms.  None = don't profile.
+        self.profile_threshold_ms = config.get("PROFILE_THRESHOLD_MS", None)
+
         # Database name.
         self.dbname = config.get("DBNAME", None)
         if self.dbname is None:
@@ -54,6 +61,8 @@ class AppConfig:  # pylint: disable=too-many-instance-attributes
         self.useraudiopath = os.path.join(self.datapath, "useraudio")
         self.userthemespath = os.path.join(self.datapath, "userthemes")
         self.temppath = os.path.join(self.datapath, "temp")
+        self.profilespath = os.path.join(self.temppath, "profiles")
+        self.cachepath = os.path.join(self.datapath, "cache")
         self.dbfilename = os.path.join(self.datapath, self.dbname)
 
         # Path to db backup.
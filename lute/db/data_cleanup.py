@@ -53,9 +53,8 @@ def _set_texts_word_count(session, output_function):
 
     output_function(f"Fixing word counts for {len(recalc)} Texts.")
     pr = ProgressReporter(len(recalc), output_function)
-    for t in recalc:
+    for t, pt in zip(recalc, Text.get_all_parsed_tokens(recalc)):
         pr.increment()
-        pt = t.book.language.get_parsed_tokens(t.text)
         words = [w for w in pt if w.is_word]
         t.word_count = len(words)
         session.add(t)
@@ -8,6 +8,8 @@ from flask import current_app
 from lute.models.setting import UserSetting
 from lute.settings.hotkey_data import initial_hotkey_defaults
 from lute.models.repositories import UserSettingRepository
+from lute.read.render import multiword_registry
+from lute.read import page_cache
 
 
 def delete_all_data(session):
@@ -28,6 +30,8 @@ def delete_all_data(session):
     for s in statements:
         session.execute(text(s))
     session.commit()
+    multiword_registry.invalidate()
+    page_cache.invalidate()
     add_default_user_settings(session, current_app.env_config.default_user_backup_path)
 
 
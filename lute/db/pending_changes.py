@@ -0,0 +1,54 @@
+"""
+Changes to in-memory data that are applied when the session commits.
+
+Some modules keep in-memory data built from the db (e.g. the multiword
+term indexers, and the rendered page cache) up to date with SQLAlchemy
+ORM events.  The events record their changes on the session with
+add(), and the changes are passed to the module's registered callback
+when the session commits.  They're discarded if the session rolls
+back, so rolled-back changes never reach the in-memory data.
+
+Deletes should be recorded in "before_delete" events rather than
+"after_delete", as the target's attributes may have been expired and
+can't be reloaded after the delete.
+
+Changes made with raw SQL aren't seen by the ORM, so code doing that
+must update or invalidate the in-memory data itself.
+"""
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Key in Session.info for the pending changes: name => [changes].
+_PENDING_KEY = "lute_pending_changes"
+
+# Name => callback, called with the list of the name's changes.
+_callbacks = {}
+
+
+def register(name, callback):
+    "Call callback(changes) with the changes added for name on commit."
+    _callbacks[name] = callback
+
+
+def add(target, name, change):
+    "Record the change for name on the target's session, if it has one."
+    session = Session.object_session(target)
+    if session is None:
+        return
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    pending.setdefault(name, []).append(change)
+
+
+@event.listens_for(Session, "after_commit")
+def _session_committed(session):
+    pending = session.info.pop(_PENDING_KEY, {})
+    for name, changes in pending.items():
+        _callbacks[name](changes)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _session_rolled_back(
+    session, previous_transaction
+):  # pylint: disable=unused-argument
+    session.info.pop(_PENDING_KEY, None)
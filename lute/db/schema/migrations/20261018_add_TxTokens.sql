@@ -0,0 +1,7 @@
+-- Persisted parsed tokens for each page, so that pages don't have to
+-- be re-parsed every time they're opened (slow for mecab and jieba).
+-- TxTokensKey is the hash of the text and the language parse settings
+-- the tokens were created with; the tokens are ignored if it doesn't
+-- match.
+alter table texts add column TxTokens BLOB null;
+alter table texts add column TxTokensKey VARCHAR(64) null;
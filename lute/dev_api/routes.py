@@ -23,6 +23,8 @@ import lute.parse.registry
 from lute.db import db
 import lute.db.management
 from lute.db.demo import Service as DemoService
+from lute.read.render import multiword_registry
+from lute.read import page_cache
 
 
 bp = Blueprint("dev_api", __name__, url_prefix="/dev_api")
@@ -123,6 +125,9 @@ def exec_sql(sql):
     "Execute arbitrary sql!!!  NO CHECKS ARE DONE!"
     db.session.execute(text(sql))
     db.session.commit()
+    # The sql may have changed terms.
+    multiword_registry.invalidate()
+    page_cache.invalidate()
     return jsonify("ok")
 
 
@@ -138,6 +143,7 @@ def disable_parser(parsername, renameto):
     p = lute.parse.registry.__LUTE_PARSERS__
     if parsername in p:
         p[renameto] = p.pop(parsername)
+    page_cache.invalidate()
     langs = db.session.query(Language).all()
     unsupported = [
         {"parser_type": lang.parser_type, "language": lang.name}
@@ -0,0 +1,107 @@
+"""
+Profile slow requests.
+
+Opt-in (set PROFILE_THRESHOLD_MS in config.yml).  When enabled, the
+parsing and rendering functions decorated with @profiled are run
+under cProfile during each request, and if the request takes longer
+than the threshold the profile is written to temp/profiles in the
+data directory.  The files can be read with pstats or snakeviz.
+
+Only the decorated functions are profiled, not the whole request, to
+keep the overhead down, and so that the profile shows where the
+parsing and rendering time goes.
+
+Only one profiler can be active in a process (python 3.12+ raises
+ValueError if another is enabled), so with concurrent requests, only
+one request at a time is profiled, and the others just run.
+"""
+
+from datetime import datetime
+import cProfile
+import functools
+import os
+import re
+import threading
+import time
+from flask import current_app, g, has_request_context, request
+
+
+# Held by the request whose profiler is enabled.
+_active = threading.Lock()
+
+
+def _enable(profiler):
+    "Enable the profiler if no other one is active.  True if enabled."
+    if not _active.acquire(blocking=False):  # pylint: disable=consider-using-with
+        return False
+    try:
+        profiler.enable()
+    except ValueError:
+        # Some other profiling tool is running.
+        _active.release()
+        return False
+    return True
+
+
+def profiled(func):
+    "Profile calls to func if the current request is being profiled."
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not has_request_context() or g.get("lute_profiler") is None:
+            return func(*args, **kwargs)
+
+        # Calls can be nested (e.g. get_textitems calls parsing), so
+        # only the outermost call enables and disables the profiler.
+        profiler = g.lute_profiler
+        g.lute_profiler_depth += 1
+        outermost = g.lute_profiler_depth == 1
+        if outermost:
+            g.lute_profiler_enabled = _enable(profiler)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            g.lute_profiler_depth -= 1
+            if outermost and g.lute_profiler_enabled:
+                profiler.disable()
+                _active.release()
+
+    return wrapper
+
+
+def _start_request():
+    g.lute_profiler = cProfile.Profile()
+    g.lute_profiler_depth = 0
+    g.lute_profiler_enabled = False
+    g.lute_profiler_start = time.perf_counter()
+
+
+def _finish_request(response):
+    profiler = g.get("lute_profiler")
+    if profiler is None:
+        return response
+    g.lute_profiler = None
+
+    elapsed_ms = (time.perf_counter() - g.lute_profiler_start) * 1000
+    if elapsed_ms < current_app.config["PROFILE_THRESHOLD_MS"]:
+        return response
+    if not profiler.getstats():
+        # Nothing profiled was called.
+        return response
+
+    outdir = current_app.config["PROFILE_DIR"]
+    os.makedirs(outdir, exist_ok=True)
+    route = request.url_rule.rule if request.url_rule else "no_route"
+    route = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_")
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    filename = f"{stamp}_{route}_{elapsed_ms:.0f}ms.prof"
+    profiler.dump_stats(os.path.join(outdir, filename))
+    return response
+
+
+def init_app(app, threshold_ms, outdir):
+    "Profile requests taking longer than threshold_ms, writing to outdir."
+    app.config["PROFILE_THRESHOLD_MS"] = threshold_ms
+    app.config["PROFILE_DIR"] = outdir
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
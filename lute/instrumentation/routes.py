@@ -0,0 +1,61 @@
+"""
+Instrumentation hooks and endpoint.
+
+The blueprint is only registered if INSTRUMENT_REQUESTS is set in the
+config, as its hooks time every request.
+"""
+
+from flask import Blueprint, request, jsonify, template_rendered, before_render_template
+from lute.db import db
+from lute.instrumentation import service
+
+
+bp = Blueprint("instrumentation", __name__, url_prefix="/instrumentation")
+
+
+@bp.record_once
+def _on_register(state):
+    "Time sql and template rendering for the app."
+    with state.app.app_context():
+        service.listen(db.engine)
+    before_render_template.connect(_template_starting, state.app)
+    template_rendered.connect(_template_rendered, state.app)
+
+
+def _template_starting(sender, template, context):  # pylint: disable=unused-argument
+    timings = service.current_timings()
+    if timings is not None:
+        timings.start_step("render")
+
+
+def _template_rendered(sender, template, context):  # pylint: disable=unused-argument
+    timings = service.current_timings()
+    if timings is not None:
+        timings.end_step("render")
+
+
+@bp.before_app_request
+def _start_request():
+    service.start_request()
+
+
+@bp.after_app_request
+def _finish_request(response):
+    route = request.url_rule.rule if request.url_rule else "(no route)"
+    timings = service.finish_request(route)
+    if timings is not None:
+        response.headers["Server-Timing"] = timings.server_timing_header()
+    return response
+
+
+@bp.route("/", methods=["GET"])
+def index():
+    "Totals for each route."
+    return jsonify(service.route_totals())
+
+
+@bp.route("/clear", methods=["GET"])
+def clear():
+    "Clear the totals."
+    service.clear()
+    return jsonify("ok")
@@ -0,0 +1,167 @@
+"""
+Per-request timing instrumentation.
+
+Opt-in (set INSTRUMENT_REQUESTS: true in config.yml).  When enabled,
+each request records its sql query count and time, and the time spent
+in named steps (e.g. "parse", "render").  The numbers are returned in
+a Server-Timing response header, and totals per route are kept for
+the /instrumentation endpoint.
+
+timer() can be used anywhere: it does nothing if the current request
+isn't being instrumented (or there is no request, e.g. in a
+background thread).
+"""
+
+from contextlib import contextmanager
+import threading
+import time
+from flask import g, has_request_context
+from sqlalchemy import event
+
+
+class RequestTimings:
+    "Timings for a single request."
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.query_count = 0
+        self.sql_time = 0.0
+        # Step name => seconds.
+        self.steps = {}
+        # Step name => start time, for steps started and not ended.
+        self._started = {}
+
+    def add(self, name, elapsed):
+        "Add elapsed seconds to the named step."
+        self.steps[name] = self.steps.get(name, 0.0) + elapsed
+
+    def start_step(self, name):
+        "Start timing the named step, for when timer() can't be used."
+        self._started[name] = time.perf_counter()
+
+    def end_step(self, name):
+        "End the named step, if it was started."
+        start = self._started.pop(name, None)
+        if start is not None:
+            self.add(name, time.perf_counter() - start)
+
+    def elapsed(self):
+        "Seconds since the request started."
+        return time.perf_counter() - self.start
+
+    def server_timing_header(self):
+        "Value for the Server-Timing header, durations in ms."
+        parts = [
+            f'sql;dur={self.sql_time * 1000:.1f};desc="{self.query_count} queries"'
+        ]
+        for name, elapsed in self.steps.items():
+            parts.append(f"{name};dur={elapsed * 1000:.1f}")
+        parts.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(parts)
+
+
+_lock = threading.Lock()
+
+# Route => totals dict.
+_route_totals = {}
+
+
+def start_request():
+    "Start timing the current request."
+    g.lute_request_timings = RequestTimings()
+
+
+def current_timings():
+    "The current request's RequestTimings, or None if not timing."
+    if not has_request_context():
+        return None
+    return g.get("lute_request_timings")
+
+
+@contextmanager
+def timer(name):
+    "Add the time spent in the block to the current request's named step."
+    timings = current_timings()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - start)
+
+
+def finish_request(route):
+    "Add the current request's timings to the route's totals."
+    timings = current_timings()
+    if timings is None:
+        return None
+    elapsed = timings.elapsed()
+    with _lock:
+        totals = _route_totals.setdefault(
+            route,
+            {
+                "requests": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "queries": 0,
+                "sql_ms": 0.0,
+                "steps_ms": {},
+            },
+        )
+        totals["requests"] += 1
+        totals["total_ms"] += elapsed * 1000
+        totals["max_ms"] = max(totals["max_ms"], elapsed * 1000)
+        totals["queries"] += timings.query_count
+        totals["sql_ms"] += timings.sql_time * 1000
+        steps = totals["steps_ms"]
+        for name, step_elapsed in timings.steps.items():
+            steps[name] = steps.get(name, 0.0) + step_elapsed * 1000
+    return timings
+
+
+def route_totals():
+    "Copy of the totals per route, with per-request averages."
+    ret = {}
+    with _lock:
+        for route, totals in _route_totals.items():
+            d = {**totals, "steps_ms": dict(totals["steps_ms"])}
+            d["avg_ms"] = d["total_ms"] / d["requests"]
+            d["avg_queries"] = d["queries"] / d["requests"]
+            ret[route] = d
+    return ret
+
+
+def clear():
+    "Clear all totals."
+    with _lock:
+        _route_totals.clear()
+
+
+## SQL events.
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):  # pylint: disable=unused-argument,too-many-arguments,too-many-positional-arguments
+    if current_timings() is not None:
+        conn.info.setdefault("lute_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):  # pylint: disable=unused-argument,too-many-arguments,too-many-positional-arguments
+    timings = current_timings()
+    starts = conn.info.get("lute_query_start")
+    if timings is None or not starts:
+        return
+    timings.query_count += 1
+    timings.sql_time += time.perf_counter() - starts.pop()
+
+
+def listen(engine):
+    "Time the engine's sql statements."
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
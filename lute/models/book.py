@@ -2,9 +2,12 @@
 Book entity.
 """
 
+import re
 import sqlite3
 from contextlib import closing
 from lute.db import db
+from lute.parse import packed_tokens
+from lute.parse.parallel import parse_all
 
 booktags = db.Table(
     "booktags",
@@ -140,7 +143,7 @@ class Book(
 
 
 # TODO zzfuture fix: rename class and table to Page/pages
-class Text(db.Model):
+class Text(db.Model):  # pylint: disable=too-many-instance-attributes
     """
     Each page in a Book.
     """
@@ -155,6 +158,10 @@ class Text(db.Model):
     bk_id = db.Column("TxBkID", db.Integer, db.ForeignKey("books.BkID"), nullable=False)
     word_count = db.Column("TxWordCount", db.Integer, nullable=True)
 
+    # Parsed tokens, see lute.parse.packed_tokens.
+    _packed_tokens = db.Column("TxTokens", db.LargeBinary, nullable=True)
+    _tokens_key = db.Column("TxTokensKey", db.String(64), nullable=True)
+
     book = db.relationship("Book", back_populates="texts")
     bookmarks = db.relationship(
         "TextBookmark",
@@ -168,9 +175,10 @@ class Text(db.Model):
         cascade="all, delete-orphan",
     )
 
-    def __init__(self, book, text, order=1):
+    def __init__(self, book, text, order=1, tokens=None):
+        "tokens are the already-parsed tokens of the text, if available."
         self.book = book
-        self.text = text
+        self._set_text(text, tokens)
         self.order = order
         self.sentences = []
 
@@ -190,10 +198,18 @@ class Text(db.Model):
 
     @text.setter
     def text(self, s):
+        self._set_text(s)
+
+    def _set_text(self, s, tokens=None):
+        "Set the text, using its parsed tokens if given."
         self._text = s
         if s.strip() == "":
             return
-        toks = self._get_parsed_tokens()
+        toks = tokens
+        if toks is None:
+            toks = self.get_parsed_tokens()
+        else:
+            self._save_parsed_tokens(toks)
         wordtoks = [t for t in toks if t.is_word]
         self.word_count = len(wordtoks)
         if self._read_date is not None:
@@ -209,10 +225,66 @@ class Text(db.Model):
         # Ensure loaded.
         self.load_sentences()
 
-    def _get_parsed_tokens(self):
-        "Return the tokens."
-        lang = self.book.language
-        return lang.parser.get_parsed_tokens(self.text, lang)
+    def get_parsed_tokens(self):
+        """
+        Return the tokens, using the saved tokens if they're current.
+
+        If they're not, the text is parsed and the tokens are saved
+        with the Text.
+        """
+        toks = self._saved_tokens()
+        if toks is None:
+            toks = self.book.language.get_parsed_tokens(self.text_to_parse(self.text))
+            self._save_parsed_tokens(toks)
+        return toks
+
+    @staticmethod
+    def text_to_parse(s):
+        """
+        The text s with runs of spaces collapsed, which is what's
+        rendered (see RenderService.get_textitems()), so the same
+        tokens are used for rendering, sentences, and word counts.
+        """
+        return re.sub(r" +", " ", s)
+
+    @staticmethod
+    def get_all_parsed_tokens(texts, use_pool=True):
+        """
+        Return the tokens for each of the texts, as for
+        get_parsed_tokens().  Texts without current saved tokens are
+        parsed in a batch for each language (see lute.parse.parallel,
+        and parse_all() for use_pool).
+        """
+        # pylint: disable=protected-access
+        ret = [t._saved_tokens() for t in texts]
+        unparsed = {}
+        for i, t in enumerate(texts):
+            if ret[i] is None:
+                lang = t.book.language
+                unparsed.setdefault(lang.id, (lang, []))[1].append(i)
+        for lang, indexes in unparsed.values():
+            to_parse = [Text.text_to_parse(texts[i].text) for i in indexes]
+            all_tokens = parse_all(lang, to_parse, use_pool)
+            for i, toks in zip(indexes, all_tokens):
+                texts[i]._save_parsed_tokens(toks)
+                ret[i] = toks
+        return ret
+
+    def _saved_tokens(self):
+        "The saved tokens, or None if they're not current."
+        tokens_key = packed_tokens.key(
+            self.text_to_parse(self.text), self.book.language
+        )
+        if self._tokens_key == tokens_key and self._packed_tokens is not None:
+            return packed_tokens.unpack(self._packed_tokens)
+        return None
+
+    def _save_parsed_tokens(self, tokens):
+        "Save the tokens with the text."
+        self._packed_tokens = packed_tokens.pack(tokens)
+        self._tokens_key = packed_tokens.key(
+            self.text_to_parse(self.text), self.book.language
+        )
 
     def _load_sentences_from_tokens(self, parsedtokens):
         "Save sentences using the tokens."
@@ -242,7 +314,7 @@ class Text(db.Model):
         """
         Parse the current text and create Sentence objects.
         """
-        toks = self._get_parsed_tokens()
+        toks = self.get_parsed_tokens()
         self._load_sentences_from_tokens(toks)
 
     def _add_sentence(self, sentence):
@@ -4,6 +4,9 @@ Language entity.
 
 import re
 from lute.db import db
+from lute.parse.base import number_tokens
+from lute.parse import parse_cache
+from lute.instrumentation.profiling import profiled
 from lute.parse.registry import get_parser, is_supported
 
 
@@ -115,8 +118,19 @@ class Language(
         "True if the language's parser is supported."
         return is_supported(self.parser_type)
 
+    @profiled
     def get_parsed_tokens(self, s):
-        return self.parser.get_parsed_tokens(s, self)
+        """
+        Parse s, returning a tuple of numbered tokens.
+
+        Parsed pages are cached (see parse_cache), so the returned
+        tokens must not be changed.
+        """
+
+        def _parse():
+            return number_tokens(self.parser.get_parsed_tokens(s, self))
+
+        return parse_cache.get_parsed_tokens(s, self, _parse)
 
     def get_lowercase(self, s) -> str:
         return self.parser.get_lowercase(s)
@@ -2,7 +2,8 @@
 Repositories.
 """
 
-from sqlalchemy import text as sqltext, and_, func
+import json
+from sqlalchemy import text as sqltext, and_, func, select
 from lute.db import db
 from lute.models.setting import UserSetting, BackupSettings, SystemSetting
 from lute.models.language import Language
@@ -199,6 +200,29 @@ class TermRepository:
             return None
         return terms[0]
 
+    def find_all_by_text_lcs(self, language_id, text_lcs, load_options=()):
+        """
+        Find all terms in the language with any of the text_lcs.
+
+        load_options are applied to the query, e.g. to eager load
+        relationships.
+
+        The text_lcs are passed as a single json parameter, rather
+        than as an IN clause with a bound parameter each, so there's
+        no limit on the number of strings, and the statement doesn't
+        need recompiling for each size.
+
+        Note: "IN (select value from json_each(...))" is used rather
+        than a join, as sqlite sometimes plans the join as a scan of
+        the language's words, which is very slow.
+        """
+        lcs = func.json_each(json.dumps(list(set(text_lcs)))).table_valued("value")
+        query = self.session.query(Term).filter(
+            Term.language_id == language_id,
+            Term.text_lc.in_(select(lcs.c.value)),
+        )
+        return query.options(*load_options).all()
+
     def delete_empty_images(self):
         """
         Data clean-up: delete empty images.
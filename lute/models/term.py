@@ -162,12 +162,35 @@ class Term(
         when new terms are created from an already-parsed
         and already-tokenized page of text.
         """
-        t = Term()
-        t.language = language
-        t._text = text  # pylint: disable=protected-access
-        t.text_lc = language.get_lowercase(text)
-        t.romanization = language.parser.get_reading(text)
-        t._calc_token_count()  # pylint: disable=protected-access
+        return Term.create_terms_no_parsing(language, [text])[0]
+
+    @staticmethod
+    def create_terms_no_parsing(language, texts):
+        """
+        Create terms for all the texts, as for create_term_no_parsing,
+        getting all of their readings in a single call.
+        """
+        readings = language.parser.get_readings(texts)
+        ret = []
+        for text, reading in zip(texts, readings):
+            t = Term()
+            t.language = language
+            t._text = text  # pylint: disable=protected-access
+            t.text_lc = language.get_lowercase(text)
+            t.romanization = reading
+            t._calc_token_count()  # pylint: disable=protected-access
+            ret.append(t)
+        return ret
+
+    @staticmethod
+    def create_spec_term(language, text):
+        """
+        Create a term for searching: the text is parsed and
+        downcased, but its reading isn't needed, and isn't looked up
+        (this can be slow, e.g. for Japanese).
+        """
+        t = Term(language)
+        t._set_new_text(language, text)  # pylint: disable=protected-access
         return t
 
     def __repr__(self):
@@ -219,11 +242,8 @@ class Term(
         lang = self.language
 
         if self.id is None:
-            t = self._parse_string_add_zws(lang, textstring)
-            self._text = t
-            self.text_lc = lang.get_lowercase(t)
-            self.romanization = lang.parser.get_reading(t)
-            self._calc_token_count()
+            self._set_new_text(lang, textstring)
+            self.romanization = lang.parser.get_reading(self._text)
         else:
             # new_lc = lang.get_lowercase(textstring)
             # print(f"new lowercase = '{new_lc}', old = '{self.text_lc}'", flush=True)
@@ -232,6 +252,13 @@ class Term(
                 raise TermTextChangedException(msg)
             self._text = textstring
 
+    def _set_new_text(self, lang, textstring):
+        "Parse the text of a new term, and set the textlc and token count."
+        t = self._parse_string_add_zws(lang, textstring)
+        self._text = t
+        self.text_lc = lang.get_lowercase(t)
+        self._calc_token_count()
+
     def _calc_token_count(self):
         "Tokens are separated by zero-width space."
         token_count = 0
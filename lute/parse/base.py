@@ -10,38 +10,21 @@ class ParsedToken:
     """
     A single parsed token from an input text.
 
-    As tokens are created, the class counters
-    (starting with cls_) are assigned to the ParsedToken
-    and then incremented appropriately.
+    The order and sentence_number are set for the full list of
+    tokens by number_tokens(), and not by the parsers, so that
+    concurrent parses don't share any state.
     """
 
-    # Class counters.
-    cls_sentence_number = 0
-    cls_order = 0
-
-    @classmethod
-    def reset_counters(cls):
-        """
-        Reset all the counters.
-        """
-        ParsedToken.cls_sentence_number = 0
-        ParsedToken.cls_order = 0
+    # Many tokens are created for each page, so don't give each
+    # one a __dict__.
+    __slots__ = ("token", "is_word", "is_end_of_sentence", "order", "sentence_number")
 
     def __init__(self, token: str, is_word: bool, is_end_of_sentence: bool = False):
         self.token = token
         self.is_word = is_word
         self.is_end_of_sentence = is_end_of_sentence
-
-        ParsedToken.cls_order += 1
-        self.order = ParsedToken.cls_order
-
-        self.sentence_number = ParsedToken.cls_sentence_number
-
-        # Increment counters after the TextToken has been
-        # completed, so that it belongs to the correct
-        # sentence.
-        if self.is_end_of_sentence:
-            ParsedToken.cls_sentence_number += 1
+        self.order = 0
+        self.sentence_number = 0
 
     @property
     def is_end_of_paragraph(self):
@@ -57,6 +40,22 @@ class ParsedToken:
         return f'<"{self.token}" ({attrs})>'
 
 
+def number_tokens(tokens):
+    """
+    Set the order (starting at 1) and sentence_number (starting at 0)
+    of each token in the list.  Returns the tokens.
+    """
+    sentence_number = 0
+    for order, t in enumerate(tokens, start=1):
+        t.order = order
+        t.sentence_number = sentence_number
+        # Increment after the token has been numbered, so that
+        # it belongs to the correct sentence.
+        if t.is_end_of_sentence:
+            sentence_number += 1
+    return tokens
+
+
 class AbstractParser(ABC):
     """
     Abstract parser, inherited from by all parsers.
@@ -93,6 +92,35 @@ class AbstractParser(ABC):
         """
         return True
 
+    @classmethod
+    def warm_up(cls):
+        """
+        Load anything slow that the parser needs (e.g. models or
+        dictionaries), so the first page parsed isn't slow.  Called
+        at startup for all supported parsers.
+        """
+        return
+
+    @classmethod
+    def is_process_safe(cls):
+        """
+        True if the parser can be used in worker processes (see
+        lute.parse.parallel).  The parser must only need the
+        language's parse settings (not the db or the app), and must
+        parse each paragraph independently of the others, so that
+        long texts can be split at line breaks.
+        """
+        return False
+
+    @classmethod
+    def data_version(cls):
+        """
+        Version of any user data that changes the parser's results
+        (e.g. an exceptions file).  Cached tokens parsed with a
+        different data version aren't used.
+        """
+        return ""
+
     @classmethod
     @abstractmethod
     def name(cls):
@@ -113,6 +141,15 @@ class AbstractParser(ABC):
         """
         return None
 
+    def get_readings(self, texts: List[str]) -> List:
+        """
+        Get the pronunciations for all of the texts.
+
+        Parsers with slow readings (e.g. ones that need an external
+        program) can override this to get them all at once.
+        """
+        return [self.get_reading(t) for t in texts]
+
     def get_lowercase(self, text: str):
         """
         Return the lowcase text.
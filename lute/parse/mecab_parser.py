@@ -10,10 +10,12 @@ Includes classes:
 
 """
 
+from contextlib import contextmanager
 from io import StringIO
 import sys
 import os
 import re
+import threading
 from typing import List
 from natto import MeCab
 import jaconv
@@ -21,6 +23,52 @@ from lute.parse.base import ParsedToken, AbstractParser
 from lute.settings.current import current_settings
 
 
+# Creating a MeCab loads its dictionary, which is slow, so MeCab
+# instances are pooled and reused.  A MeCab can't be used by two
+# threads at once, so each is only used by one caller at a time.
+
+# Max idle MeCabs kept for each set of flags.
+MAX_IDLE_MECABS = 4
+
+_pool_lock = threading.Lock()
+
+# Flags => idle MeCab instances.
+_idle_mecabs = {}
+
+# Bumped when the pool is cleared, so that MeCabs in use then (e.g.
+# created with an old MECAB_PATH) aren't returned to the pool.
+_pool_generation = 0  # pylint: disable=invalid-name
+
+
+@contextmanager
+def _pooled_mecab(flags):
+    "A MeCab for the flags, from the pool if possible."
+    with _pool_lock:
+        generation = _pool_generation
+        idle = _idle_mecabs.get(flags)
+        nm = idle.pop() if idle else None
+    if nm is None:
+        nm = MeCab(flags)
+
+    # If the caller fails, don't reuse the MeCab, in case it's in a
+    # bad state.  Unused MeCabs are freed when they're garbage
+    # collected.
+    yield nm
+
+    with _pool_lock:
+        idle = _idle_mecabs.setdefault(flags, [])
+        if generation == _pool_generation and len(idle) < MAX_IDLE_MECABS:
+            idle.append(nm)
+
+
+def clear_mecab_pool():
+    "Discard all pooled MeCabs, e.g. if the mecab path changes."
+    global _pool_generation  # pylint: disable=global-statement
+    with _pool_lock:
+        _pool_generation += 1
+        _idle_mecabs.clear()
+
+
 class JapaneseParser(AbstractParser):
     """
     Japanese parser.
@@ -36,6 +84,12 @@ class JapaneseParser(AbstractParser):
     _is_supported = None
     _old_mecab_path = None
 
+    # Flags: ref https://github.com/buruzaemon/natto-py:
+    #    -F = node format
+    #    -U = unknown format
+    #    -E = EOP format
+    _PARSE_FLAGS = r"-F %m\t%t\t%h\n -U %m\t%t\t%h\n -E EOP\t3\t7\n"
+
     @classmethod
     def is_supported(cls):
         """
@@ -49,6 +103,9 @@ class JapaneseParser(AbstractParser):
         if path_unchanged and JapaneseParser._is_supported is not None:
             return JapaneseParser._is_supported
 
+        # MeCabs created with the old path can't be reused.
+        clear_mecab_pool()
+
         # Natto uses the MECAB_PATH env key if it's set.
         env_key = "MECAB_PATH"
         if mecab_path != "":
@@ -78,6 +135,17 @@ class JapaneseParser(AbstractParser):
     def name(cls):
         return "Japanese"
 
+    @classmethod
+    def is_process_safe(cls):
+        "Workers load their own MeCab, using the inherited MECAB_PATH."
+        return True
+
+    @classmethod
+    def warm_up(cls):
+        "Create a MeCab for parsing (loading its dictionary) in the pool."
+        with _pooled_mecab(cls._PARSE_FLAGS):
+            pass
+
     def get_parsed_tokens(self, text: str, language) -> List[ParsedToken]:
         "Parse the string using MeCab."
         text = re.sub(r"[ \t]+", " ", text).strip()
@@ -86,11 +154,7 @@ class JapaneseParser(AbstractParser):
 
         # If the string contains a "\n", MeCab appears to silently
         # remove it.  Splitting it works (ref test_JapaneseParser).
-        # Flags: ref https://github.com/buruzaemon/natto-py:
-        #    -F = node format
-        #    -U = unknown format
-        #    -E = EOP format
-        with MeCab(r"-F %m\t%t\t%h\n -U %m\t%t\t%h\n -E EOP\t3\t7\n") as nm:
+        with _pooled_mecab(self._PARSE_FLAGS) as nm:
             for para in text.split("\n"):
                 for n in nm.parse(para, as_nodes=True):
                     lines.append(n.feature)
@@ -140,19 +204,31 @@ class JapaneseParser(AbstractParser):
         Returns None if the text is all hiragana, or the pronunciation
         doesn't add value (same as text).
         """
-        if self._string_is_hiragana(text):
-            return None
+        return self.get_readings([text])[0]
 
+    def get_readings(self, texts: List[str]) -> List:
+        "Get the pronunciations of all the texts, using a single MeCab."
         jp_reading_setting = current_settings.get("japanese_reading", "").strip()
         if jp_reading_setting == "":
             # Don't set reading if nothing specified.
-            return None
+            return [None for _ in texts]
+
+        texts_needing_readings = [t for t in texts if not self._string_is_hiragana(t)]
+        if len(texts_needing_readings) == 0:
+            return [None for _ in texts]
 
         flags = r"-O yomi"
+        with _pooled_mecab(flags) as nm:
+            return [self._get_mecab_reading(nm, t, jp_reading_setting) for t in texts]
+
+    def _get_mecab_reading(self, nm, text, jp_reading_setting):
+        "Get the reading using MeCab nm."
+        if self._string_is_hiragana(text):
+            return None
+
         readings = []
-        with MeCab(flags) as nm:
-            for n in nm.parse(text, as_nodes=True):
-                readings.append(n.feature)
+        for n in nm.parse(text, as_nodes=True):
+            readings.append(n.feature)
         readings = [r.strip() for r in readings if r is not None and r.strip() != ""]
 
         ret = "".join(readings).strip()
@@ -0,0 +1,47 @@
+"""
+Compact representation of parsed tokens, for saving in the db.
+
+Tokens are packed as zlib-compressed json: the token strings, and a
+string of flags (is_word and is_end_of_sentence) per token.
+
+The key() of the text and language is saved with the packed tokens;
+if the text, the language's parse settings, or the Lute version
+(which may change the parsers) change, the key changes, and the
+saved tokens must not be used.
+"""
+
+import hashlib
+import json
+import zlib
+from lute import __version__
+from lute.parse.base import ParsedToken, number_tokens
+from lute.parse.parse_cache import parse_settings
+
+_IS_WORD = 1
+_IS_EOS = 2
+
+
+def key(s, language):
+    "Key for s parsed with the language's current settings."
+    data = json.dumps([__version__, parse_settings(language), s])
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def pack(tokens):
+    "Pack the tokens to bytes."
+    strings = [t.token for t in tokens]
+    flags = "".join(
+        str((_IS_WORD if t.is_word else 0) | (_IS_EOS if t.is_end_of_sentence else 0))
+        for t in tokens
+    )
+    return zlib.compress(json.dumps([strings, flags]).encode("utf-8"))
+
+
+def unpack(data):
+    "Unpack bytes from pack() to a tuple of numbered tokens."
+    strings, flags = json.loads(zlib.decompress(data).decode("utf-8"))
+    tokens = [
+        ParsedToken(s, bool(int(f) & _IS_WORD), bool(int(f) & _IS_EOS))
+        for s, f in zip(strings, flags)
+    ]
+    return tuple(number_tokens(tokens))
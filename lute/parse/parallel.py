@@ -0,0 +1,134 @@
+"""
+Parsing many texts at once, e.g. all of the pages of a book.
+
+Whole-book operations (book import, data cleanup, exports) parse many
+independent texts, which is slow for big books on a single core.  If
+the language's parser is process-safe (see
+AbstractParser.is_process_safe()), and there's enough text, the texts
+are split into pieces at line breaks and parsed in a pool of worker
+processes.  The workers return compact token arrays (the token
+strings and a bytes of flags), which are much faster to send back
+than ParsedTokens.
+
+Otherwise, or if the pool can't be used, the texts are parsed in the
+current process.  Batches aren't added to the parse_cache, as they'd
+push out the pages being read.
+"""
+
+import functools
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+from types import SimpleNamespace
+from lute.parse.base import ParsedToken, number_tokens
+
+# Less text than this is parsed faster than the workers can start.
+MIN_CHARS = 200000
+
+# Approx size of the pieces sent to the workers.
+PIECE_CHARS = 20000
+
+MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+_IS_WORD = 1
+_IS_EOS = 2
+
+# The language settings used by the parsers.
+_LANGUAGE_FIELDS = (
+    "parser_type",
+    "word_characters",
+    "regexp_split_sentences",
+    "exceptions_split_sentences",
+    "character_substitutions",
+)
+
+# Pieces only break at a newline between two non-space characters, so
+# that the parsers' stripping of whitespace gives the same result for
+# the pieces as for the full text.
+_BREAK_RE = re.compile(r"(?<=\S)\n(?=\S)")
+
+
+def split_pieces(s, size):
+    "Split s into pieces of at least size chars, each ending with a newline."
+    pieces = []
+    start = 0
+    for m in _BREAK_RE.finditer(s):
+        if m.end() - start >= size:
+            pieces.append(s[start : m.end()])
+            start = m.end()
+    pieces.append(s[start:])
+    return pieces
+
+
+def _parse_packed(parser_class, language, s):
+    "Parse s (in a worker), returns the token strings and flags."
+    tokens = parser_class().get_parsed_tokens(s, language)
+    strings = [t.token for t in tokens]
+    flags = bytes(
+        (_IS_WORD if t.is_word else 0) | (_IS_EOS if t.is_end_of_sentence else 0)
+        for t in tokens
+    )
+    return strings, flags
+
+
+def _unpack(strings, flags):
+    "ParsedTokens for the token strings and flags."
+    return [
+        ParsedToken(s, bool(f & _IS_WORD), bool(f & _IS_EOS))
+        for s, f in zip(strings, flags)
+    ]
+
+
+def _parse_in_pool(parser, language, texts, workers):
+    "Parse the texts in a process pool, returns lists of tokens."
+    text_pieces = [split_pieces(s, PIECE_CHARS) for s in texts]
+    all_pieces = [p for pieces in text_pieces for p in pieces]
+
+    settings = SimpleNamespace(**{f: getattr(language, f) for f in _LANGUAGE_FIELDS})
+    func = functools.partial(_parse_packed, type(parser), settings)
+    chunksize = max(1, len(all_pieces) // (workers * 4))
+
+    # "spawn" is used everywhere, as forking a process with threads
+    # (e.g. the parser warm-up) isn't safe.
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as executor:
+        results = iter(executor.map(func, all_pieces, chunksize=chunksize))
+        ret = []
+        for pieces in text_pieces:
+            tokens = []
+            for _ in pieces:
+                tokens.extend(_unpack(*next(results)))
+            ret.append(tokens)
+        return ret
+
+
+def _worker_count(parser, texts):
+    "Number of worker processes to parse the texts, 0 to parse here."
+    total_chars = sum(len(s) for s in texts)
+    if total_chars < MIN_CHARS or not parser.is_process_safe():
+        return 0
+    workers = min(MAX_WORKERS, total_chars // PIECE_CHARS)
+    return workers if workers > 1 else 0
+
+
+def parse_all(language, texts, use_pool=True):
+    """
+    Parse each of the texts, returns a list of numbered token tuples.
+
+    If use_pool is False, the texts are always parsed in the current
+    process, e.g. during web requests.
+    """
+    parser = language.parser
+    tokens = None
+    workers = _worker_count(parser, texts) if use_pool else 0
+    if workers > 0:
+        try:
+            tokens = _parse_in_pool(parser, language, texts, workers)
+        except (BrokenProcessPool, OSError):
+            # The workers couldn't be started, so parse here instead.
+            tokens = None
+    if tokens is None:
+        tokens = [parser.get_parsed_tokens(s, language) for s in texts]
+    return [tuple(number_tokens(toks)) for toks in tokens]
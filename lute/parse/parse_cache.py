@@ -0,0 +1,78 @@
+"""
+Cache of parsed tokens for page-sized strings.
+
+The same page text is parsed many times (word counts, sentences,
+rendering, stats), and some parsers (e.g. mecab and jieba) are slow,
+so the tokens are cached, keyed by the text and the language's
+parsing settings.  Changing the text or the settings changes the key,
+so stale entries are never used, and just fall out of the cache.
+
+The cached tokens are shared by all callers, so they are returned as
+tuples, and callers must not change the tokens.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Max number of parsed strings to cache.
+MAX_ENTRIES = 100
+
+# Shorter strings (e.g. terms) are cheap to parse, and caching them
+# would push the pages out of the cache.
+MIN_LENGTH = 100
+
+_lock = threading.Lock()
+
+# Key => token tuple.  Least recently used first.
+_entries = OrderedDict()
+
+
+def parse_settings(language):
+    "The language settings that change how strings are parsed."
+    return (
+        language.parser_type,
+        language.word_characters,
+        language.regexp_split_sentences,
+        language.exceptions_split_sentences,
+        language.character_substitutions,
+        language.parser.data_version(),
+    )
+
+
+def _key(s, language):
+    "Key for the string parsed with the language's current settings."
+    text_hash = hashlib.sha256(s.encode("utf-8")).hexdigest()
+    return (text_hash, language.id, parse_settings(language))
+
+
+def get_parsed_tokens(s, language, parse):
+    """
+    Return the cached tokens for s, or the result of parse() if
+    they're not cached.
+    """
+    if len(s) < MIN_LENGTH:
+        return tuple(parse())
+
+    key = _key(s, language)
+    with _lock:
+        tokens = _entries.get(key)
+        if tokens is not None:
+            _entries.move_to_end(key)
+            return tokens
+
+    # Parse outside of the lock, so other threads aren't blocked by
+    # slow parsers.
+    tokens = tuple(parse())
+    with _lock:
+        _entries[key] = tokens
+        _entries.move_to_end(key)
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+    return tokens
+
+
+def clear():
+    "Remove all cached tokens."
+    with _lock:
+        _entries.clear()
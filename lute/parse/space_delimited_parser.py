@@ -11,14 +11,25 @@ Includes classes:
 """
 
 import functools
+import hashlib
+import os
 import re
 import sys
 import unicodedata
 
 from typing import List
 
+from platformdirs import PlatformDirs
 from lute.parse.base import ParsedToken, AbstractParser
 
+# Where the calculated default word characters are saved.
+# create_app() changes this to the cache dir in the Lute data folder.
+WORD_CHARACTERS_CACHE_DIR = PlatformDirs("Lute3", "Lute3").user_cache_dir
+
+# Unicode categories of the default word characters.
+# Reference: https://www.compart.com/en/unicode/category
+WORD_CHARACTER_CATEGORIES = {"Cf", "Ll", "Lm", "Lo", "Lt", "Lu", "Mc", "Mn", "Sk"}
+
 
 class SpaceDelimitedParser(AbstractParser):
     """
@@ -30,19 +41,53 @@ class SpaceDelimitedParser(AbstractParser):
     def name(cls):
         return "Space Delimited"
 
-    @staticmethod
-    @functools.lru_cache
-    def compile_re_pattern(pattern: str, *args, **kwargs) -> re.Pattern:
-        """Compile regular expression pattern, cache result for fast re-use."""
-        return re.compile(pattern, *args, **kwargs)
+    @classmethod
+    def warm_up(cls):
+        "Get the default word characters, which may need calculating."
+        cls.get_default_word_characters()
 
     @staticmethod
     @functools.lru_cache
     def get_default_word_characters() -> str:
-        """Return default value for lang.word_characters."""
+        """
+        Return default value for lang.word_characters.
 
-        # Unicode categories reference: https://www.compart.com/en/unicode/category
-        categories = set(["Cf", "Ll", "Lm", "Lo", "Lt", "Lu", "Mc", "Mn", "Sk"])
+        Calculating this takes a while (it checks every unicode
+        character), so the result is saved in the user cache dir.  It
+        only changes with the unicode database version and the word
+        categories, which are in the file name.
+        """
+        categories = ",".join(sorted(WORD_CHARACTER_CATEGORIES))
+        cathash = hashlib.sha1(categories.encode("utf-8")).hexdigest()[:8]
+        filename = os.path.join(
+            WORD_CHARACTERS_CACHE_DIR,
+            f"default_word_characters_{unicodedata.unidata_version}_{cathash}.txt",
+        )
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                ret = f.read()
+            if ret != "":
+                return ret
+        except OSError:
+            pass
+
+        ret = SpaceDelimitedParser._calc_default_word_characters()
+        try:
+            os.makedirs(WORD_CHARACTERS_CACHE_DIR, exist_ok=True)
+            # Write to a temp file first, so that other processes
+            # never read a partial file.
+            tmpfile = f"{filename}.{os.getpid()}.tmp"
+            with open(tmpfile, "w", encoding="utf-8") as f:
+                f.write(ret)
+            os.replace(tmpfile, filename)
+        except OSError:
+            # Not cached, it will be recalculated next time.
+            pass
+        return ret
+
+    @staticmethod
+    def _calc_default_word_characters() -> str:
+        "Calculate ranges of the characters in the word categories."
 
         # There are more than 130,000 characters across all these categories.
         # Expressing this a single character at a time, mostly using unicode
@@ -66,7 +111,7 @@ class SpaceDelimitedParser(AbstractParser):
             ranges.append(range_string)
 
         for i in range(1, sys.maxunicode):
-            if unicodedata.category(chr(i)) not in categories:
+            if unicodedata.category(chr(i)) not in WORD_CHARACTER_CATEGORIES:
                 if current is not None:
                     add_current_to_ranges()
                     current = None
@@ -166,94 +211,105 @@ class SpaceDelimitedParser(AbstractParser):
         # Remove zero-width spaces.
         clean_text = clean_text.replace(chr(0x200B), "")
 
-        return self._parse_to_tokens(clean_text, language)
+        tokenizer = _get_tokenizer(
+            language.character_substitutions,
+            language.word_characters,
+            language.exceptions_split_sentences,
+            language.regexp_split_sentences,
+        )
+        return tokenizer.tokenize(clean_text)
+
 
-    def preg_match_capture(self, pattern, subject):
-        """
-        Return the matched text and their start positions in the subject.
+@functools.lru_cache(maxsize=32)
+def _get_tokenizer(substitutions, word_characters, exceptions, split_sentences):
+    """
+    Tokenizer for the language settings.
 
-        E.g. search for r'cat' in "there is a CAT and a Cat" returns:
-        [['CAT', 11], ['Cat', 21]]
-        """
-        compiled = SpaceDelimitedParser.compile_re_pattern(pattern, flags=re.IGNORECASE)
-        matches = compiled.finditer(subject)
-        result = [[match.group(), match.start()] for match in matches]
-        return result
+    Cached by the settings, so each language's tokenizer is only built
+    once, and editing the language's settings gets a new tokenizer.
+    """
+    return _Tokenizer(substitutions, word_characters, exceptions, split_sentences)
 
-    def _parse_to_tokens(self, text: str, lang):
-        """
-        Returns ParsedToken array for given language.
-        """
-        replacements = lang.character_substitutions.split("|")
-        for replacement in replacements:
+
+class _Tokenizer:
+    """
+    Splits text into ParsedTokens, using compiled patterns built from
+    a language's settings.
+    """
+
+    def __init__(self, substitutions, word_characters, exceptions, split_sentences):
+        self.replacements = []
+        for replacement in substitutions.split("|"):
             fromto = replacement.strip().split("=")
             if len(fromto) >= 2:
-                rfrom = fromto[0].strip()
-                rto = fromto[1].strip()
-                text = text.replace(rfrom, rto)
+                self.replacements.append((fromto[0].strip(), fromto[1].strip()))
+
+        termchar = word_characters.strip()
+        if not termchar:
+            termchar = SpaceDelimitedParser.get_default_word_characters()
+        splitex = exceptions.replace(".", "\\.")
+        pattern = rf"({splitex}|[{termchar}]*)"
+        if splitex.strip() == "":
+            pattern = rf"([{termchar}]*)"
+        self.word_re = re.compile(pattern, flags=re.IGNORECASE)
+
+        splitchar = split_sentences.strip()
+        if not splitchar:
+            splitchar = SpaceDelimitedParser.get_default_regexp_split_sentences()
+        self.eos_re = re.compile(f"[{re.escape(splitchar)}]", flags=re.IGNORECASE)
+
+        # The whole text is tokenized in one pass, with paragraph
+        # markers added for newlines in the non-word tokens.  That
+        # doesn't work if words can contain newlines, so then each
+        # paragraph has to be tokenized separately.
+        self.words_span_newlines = "\n" in self.word_re.match("\n").group()
+
+    def tokenize(self, text: str) -> List[ParsedToken]:
+        "Return tokens for the text, with a ¶ token for each newline."
+        for rfrom, rto in self.replacements:
+            text = text.replace(rfrom, rto)
 
         text = text.replace("\r\n", "\n")
         text = text.replace("{", "[")
         text = text.replace("}", "]")
 
         tokens = []
-        paras = text.split("\n")
-        pcount = len(paras)
-        for i, para in enumerate(paras):
-            self.parse_para(para, lang, tokens)
-            if i != (pcount - 1):
-                tokens.append(ParsedToken("¶", False, True))
+        if not self.words_span_newlines:
+            self._add_tokens(text, tokens)
+            return tokens
 
+        for i, para in enumerate(text.split("\n")):
+            if i > 0:
+                tokens.append(ParsedToken("¶", False, True))
+            self._add_tokens(para, tokens)
         return tokens
 
-    def parse_para(self, text: str, lang, tokens: List[ParsedToken]):
+    def _add_tokens(self, text, tokens):
+        "Add word tokens, and the non-word tokens between them."
+        pos = 0
+        for m in self.word_re.finditer(text):
+            if m.start() == m.end():
+                continue
+            self._add_non_words(text[pos : m.start()], tokens)
+            tokens.append(ParsedToken(m.group(), True, False))
+            pos = m.end()
+        self._add_non_words(text[pos:], tokens)
+
+    def _add_non_words(self, s, tokens):
         """
-        Parse a string, appending the tokens to the list of tokens.
+        Add non-word token s, marked as an end-of-sentence if it
+        contains any of the split_sentence characters.  Newlines are
+        split out as paragraph marker tokens.
         """
-        termchar = lang.word_characters.strip()
-        if not termchar:
-            termchar = SpaceDelimitedParser.get_default_word_characters()
-
-        splitex = lang.exceptions_split_sentences.replace(".", "\\.")
-        pattern = rf"({splitex}|[{termchar}]*)"
-        if splitex.strip() == "":
-            pattern = rf"([{termchar}]*)"
-
-        m = self.preg_match_capture(pattern, text)
-        wordtoks = list(filter(lambda t: t[0] != "", m))
-
-        def add_non_words(s):
-            """
-            Add non-word token s to the list of tokens.  If s
-            matches any of the split_sentence values, mark it as an
-            end-of-sentence.
-            """
-            if not s:
-                return
-            splitchar = lang.regexp_split_sentences.strip()
-            if not splitchar:
-                splitchar = SpaceDelimitedParser.get_default_regexp_split_sentences()
-            pattern = f"[{re.escape(splitchar)}]"
-            has_eos = False
-            if pattern != "[]":  # Should never happen, but ...
-                allmatches = self.preg_match_capture(pattern, s)
-                has_eos = len(allmatches) > 0
-            tokens.append(ParsedToken(s, False, has_eos))
-
-        # For each wordtok, add all non-words before the wordtok, and
-        # then add the wordtok.
-        pos = 0
-        for wt in wordtoks:
-            w = wt[0]
-            wp = wt[1]
-            s = text[pos:wp]
-            add_non_words(s)
-            tokens.append(ParsedToken(w, True, False))
-            pos = wp + len(w)
-
-        # Add anything left over.
-        s = text[pos:]
-        add_non_words(s)
+        if "\n" not in s:
+            if s:
+                has_eos = self.eos_re.search(s) is not None
+                tokens.append(ParsedToken(s, False, has_eos))
+            return
+        for i, part in enumerate(s.split("\n")):
+            if i > 0:
+                tokens.append(ParsedToken("¶", False, True))
+            self._add_non_words(part, tokens)
 
 
 class TurkishParser(SpaceDelimitedParser):
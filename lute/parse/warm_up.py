@@ -0,0 +1,81 @@
+"""
+Parser warm-up at startup.
+
+Some parsers load models or dictionaries the first time they're used
+(see AbstractParser.warm_up()), which would make the first page
+opened slow.  At startup, the parsers used by the db languages are
+warmed up in a background thread, and the status and timing of each
+is kept for the index page and /parser_status.
+"""
+
+import threading
+import time
+from lute.parse.registry import supported_parsers
+
+_lock = threading.Lock()
+
+# Parser type => status dict (name, state, ms, error).
+_status = {}
+
+WAITING = "waiting"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+
+
+def _set_status(parser_type, **kwargs):
+    with _lock:
+        _status[parser_type] = {**_status[parser_type], **kwargs}
+
+
+def _warm_up_all(parsers, output_func):
+    "Warm up the (parser type, class) parsers in order."
+    for parser_type, klass in parsers:
+        _set_status(parser_type, state=WARMING)
+        started = time.perf_counter()
+        try:
+            klass.warm_up()
+            ms = (time.perf_counter() - started) * 1000
+            _set_status(parser_type, state=READY, ms=round(ms))
+            output_func(f"Parser {klass.name()} ready ({ms:.0f} ms).")
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # The parser will still load what it needs when first used.
+            ms = (time.perf_counter() - started) * 1000
+            _set_status(parser_type, state=FAILED, ms=round(ms), error=str(e))
+            output_func(f"Warm up of parser {klass.name()} failed: {e}")
+
+
+def start(parser_types, output_func=None):
+    """
+    Warm up the supported parsers among parser_types in a background
+    thread.  Returns the thread.
+    """
+    parsers = [(t, k) for t, k in supported_parsers() if t in parser_types]
+    with _lock:
+        for parser_type, klass in parsers:
+            _status[parser_type] = {
+                "name": klass.name(),
+                "state": WAITING,
+                "ms": None,
+                "error": None,
+            }
+    thread = threading.Thread(
+        target=_warm_up_all,
+        args=(parsers, output_func or (lambda s: None)),
+        name="lute-parser-warmup",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def status():
+    "List of status dicts, for each parser being warmed up."
+    with _lock:
+        return [{"parser_type": k, **v} for k, v in sorted(_status.items())]
+
+
+def all_ready():
+    "True if no parser is still waiting or warming up."
+    with _lock:
+        return all(s["state"] in (READY, FAILED) for s in _status.values())
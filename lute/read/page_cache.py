@@ -0,0 +1,138 @@
+"""
+Cache of rendered reading page content.
+
+Rendering a page requires parsing it, finding all of its terms, and
+calculating the TextItems, which is slow for big pages.  The rendered
+content only changes if the page text, the language, or the language's
+terms change, so it's cached per Text.id.
+
+Each language has a "term generation" counter that is bumped whenever
+its terms or settings are saved or deleted.  Cached content is only
+used if it was rendered for the same text and term generation.
+
+Changes are tracked with ORM events, and the generations are bumped
+when the session commits (see lute.db.pending_changes).  Code changing
+terms or languages with raw SQL must call invalidate() or
+bump_term_generation().
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from sqlalchemy import event
+from lute.db import pending_changes
+from lute.models.term import Term
+from lute.models.language import Language
+
+# Max number of pages to cache.
+MAX_PAGES = 20
+
+_lock = threading.Lock()
+
+# Held while a page is rendered, so that the reader and the background
+# pre-renderer don't render the same page (and save the same new
+# terms) at the same time.
+render_lock = threading.Lock()
+
+# Language id => term generation.
+_generations = {}
+
+# Bumped by invalidate(), so that all existing keys are stale.
+_global_generation = 0  # pylint: disable=invalid-name
+
+# Text id => (key, content).  Least recently used first.
+_pages = OrderedDict()
+
+# Name of the changed language ids in lute.db.pending_changes.
+_CHANGES = "page_cache"
+
+
+def term_generation(language_id):
+    "Current term generation for the language."
+    with _lock:
+        return (_global_generation, _generations.get(language_id, 0))
+
+
+def _bump(language_ids):
+    "Bump the term generation of the languages."
+    with _lock:
+        for langid in set(language_ids):
+            _generations[langid] = _generations.get(langid, 0) + 1
+
+
+def bump_term_generation(language_id):
+    "Mark the language's cached pages as stale, e.g. after a raw SQL update."
+    _bump([language_id])
+
+
+def invalidate():
+    "Mark all cached content as stale."
+    global _global_generation  # pylint: disable=global-statement
+    with _lock:
+        _global_generation += 1
+        _pages.clear()
+
+
+def key_for(text):
+    "Cache key for the text's current content."
+    lang_id = text.book.language.id
+    text_hash = hashlib.sha256(text.text.encode("utf-8")).hexdigest()
+    return (lang_id, term_generation(lang_id), text_hash)
+
+
+def get(text):
+    "Get cached content for the text, or None if missing or stale."
+    key = key_for(text)
+    with _lock:
+        entry = _pages.get(text.id)
+        if entry is None or entry[0] != key:
+            return None
+        _pages.move_to_end(text.id)
+        return entry[1]
+
+
+def put(text, key, content):
+    "Cache content rendered for the text with the given key."
+    if text.id is None:
+        return
+    with _lock:
+        _pages[text.id] = (key, content)
+        _pages.move_to_end(text.id)
+        while len(_pages) > MAX_PAGES:
+            _pages.popitem(last=False)
+
+
+pending_changes.register(_CHANGES, _bump)
+
+
+## ORM events.
+
+
+def _add_pending(target, language_id):
+    "Record changed language, to bump on commit."
+    if language_id is not None:
+        pending_changes.add(target, _CHANGES, language_id)
+
+
+@event.listens_for(Term, "after_insert")
+def _term_inserted(mapper, connection, target):  # pylint: disable=unused-argument
+    # New single-word unknown (status 0) terms are saved for all of
+    # a page's words when it's rendered, so any page with the word
+    # already had it saved when it was rendered.  They can't change
+    # any cached page, and bumping the generation for them would make
+    # rendering (or pre-rendering) one page invalidate the others.
+    if target.status == 0 and target.token_count == 1:
+        return
+    _add_pending(target, target.language_id)
+
+
+@event.listens_for(Term, "after_update")
+@event.listens_for(Term, "before_delete")
+def _term_changed(mapper, connection, target):  # pylint: disable=unused-argument
+    _add_pending(target, target.language_id)
+
+
+@event.listens_for(Language, "after_update")
+@event.listens_for(Language, "before_delete")
+def _language_changed(mapper, connection, target):  # pylint: disable=unused-argument
+    _add_pending(target, target.id)
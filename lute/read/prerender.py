@@ -0,0 +1,55 @@
+"""
+Background pre-rendering of the next pages of a book.
+
+When a page is opened, the following pages are rendered in a worker
+thread and stored in the page cache, so that turning the page doesn't
+have to wait for parsing and rendering (which can be slow for some
+parsers, e.g. mecab).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from lute.db import db
+from lute.models.repositories import BookRepository
+from lute.read.service import Service
+
+# A single worker: pre-rendering shouldn't compete with the reader
+# for the db.
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lute-prerender")
+
+_lock = threading.Lock()
+
+# (book id, page num) already queued.
+_queued = set()
+
+
+def _prerender(app, bookid, pagenum, render_paragraphs):
+    "Render the page into the page cache."
+    with _lock:
+        _queued.discard((bookid, pagenum))
+    try:
+        with app.app_context():
+            book = BookRepository(db.session).find(bookid)
+            if book is None or pagenum > book.page_count:
+                return
+            svc = Service(db.session)
+            svc.get_page_content(book, pagenum, False, render_paragraphs)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        # The reader will render the page anyway if this failed.
+        app.logger.warning(f"Pre-render of book {bookid} page {pagenum} failed: {e}")
+
+
+def schedule(app, book, pagenum, count, render_paragraphs):
+    """
+    Queue pre-rendering of the count pages after pagenum.
+
+    render_paragraphs is called in an app context in the worker
+    thread, and must not need a request.
+    """
+    for p in range(pagenum + 1, min(pagenum + count, book.page_count) + 1):
+        key = (book.id, p)
+        with _lock:
+            if key in _queued:
+                continue
+            _queued.add(key)
+        _executor.submit(_prerender, app, book.id, p, render_paragraphs)
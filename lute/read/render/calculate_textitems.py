@@ -20,9 +20,10 @@ with some of the Terms overlapping:
 """
 
 import re
-from collections import Counter
 from lute.models.term import Term
+from lute.instrumentation.profiling import profiled
 from lute.read.render.text_item import TextItem
+from lute.read.render.token_trie import get_token_indexes
 
 # from lute.utils.debug_helpers import DebugTimer
 
@@ -39,7 +40,12 @@ def get_string_indexes(strings, content):
     strings and content must be lowercased!
     """
     searchcontent = zws + content + zws
-    zwsindexes = [index for index, letter in enumerate(searchcontent) if letter == zws]
+
+    # Char offset of each zws => its token index.
+    zwsindexes = {}
+    for letter_pos, letter in enumerate(searchcontent):
+        if letter == zws:
+            zwsindexes[letter_pos] = len(zwsindexes)
 
     ret = []
 
@@ -50,8 +56,7 @@ def get_string_indexes(strings, content):
         #   how-to-use-regex-to-find-all-overlapping-matches
         pattern = rf"(?=({re.escape(zws + s + zws)}))"
         add_matches = [
-            (s, zwsindexes.index(m.start()))
-            for m in re.finditer(pattern, searchcontent)
+            (s, zwsindexes[m.start()]) for m in re.finditer(pattern, searchcontent)
         ]
         ret.extend(add_matches)
 
@@ -88,13 +93,39 @@ def _create_missing_status_0_terms(tokens, terms, language):
     # Note: create the terms _without parsing_ because some parsers
     # break up characters when the words are given out of context.
     missing_word_tokens = list(set(missing_word_tokens))
-    new_terms = [Term.create_term_no_parsing(language, t) for t in missing_word_tokens]
+    new_terms = Term.create_terms_no_parsing(language, missing_word_tokens)
     for t in new_terms:
         t.status = 0
 
     return new_terms
 
 
+def _set_display_counts(textitems):
+    """
+    Set the display_count of each of the sorted textitems.
+
+    This is equivalent to "writing out" the textitems to an output
+    array with one slot per token, in reverse order so that earlier
+    textitems overwrite later ones, and then counting the slots each
+    textitem owns.  But it's done in one pass, without the array:
+
+    The textitems are sorted by index, so the slots at or after a
+    textitem's index that are covered by earlier textitems are always
+    a single run, from its index up to the furthest end of any
+    earlier textitem.  The textitem owns the rest of its slots.
+    """
+    covered_to = 0
+    for ti in textitems:
+        end = ti.index + ti.token_count
+        if end <= covered_to:
+            ti.display_count = 0
+            continue
+        start = ti.index if ti.index > covered_to else covered_to
+        ti.display_count = end - start
+        covered_to = end
+
+
+@profiled
 def get_textitems(tokens, terms, language, multiword_term_indexer=None):
     """
     Return TextItems that will **actually be rendered**.
@@ -221,13 +252,16 @@ def get_textitems(tokens, terms, language, multiword_term_indexer=None):
     # Multiword terms.
     if multiword_term_indexer is not None:
         for r in multiword_term_indexer.search_all(tokens_lc):
-            mwt = text_to_term[r[0]]
+            mwt = text_to_term.get(r[0], None)
+            if mwt is None:
+                # Indexed term not in the given terms.
+                continue
             count = mwt.token_count
             _add_textitem(r[1], r[0], count)
         # dt.step(f"get mw textitems w indexer")
     else:
         multiword_terms = [t.text_lc for t in all_terms if t.token_count > 1]
-        for e in get_string_indexes(multiword_terms, zws.join(tokens_lc)):
+        for e in get_token_indexes(multiword_terms, tokens_lc):
             count = e[0].count(zws) + 1
             _add_textitem(e[1], e[0], count)
         # dt.step("mw textitems without indexer")
@@ -235,17 +269,7 @@ def get_textitems(tokens, terms, language, multiword_term_indexer=None):
     # Sorting by index, then decreasing token count.
     textitems = sorted(textitems, key=lambda x: (x.index, -x.token_count))
 
-    # "Write out" TextItems to the output array.
-    output_textitem_ids = [None] * len(tokens)
-    for ti in reversed(textitems):
-        for c in range(ti.index, ti.index + ti.token_count):
-            output_textitem_ids[c] = id(ti)
-
-    # Calc display_counts; e.g. if a textitem's id shows up 3 times
-    # in the output_textitem_ids, it should display 3 tokens.
-    id_counts = dict(Counter(output_textitem_ids))
-    for ti in textitems:
-        ti.display_count = id_counts.get(id(ti), 0)
+    _set_display_counts(textitems)
     # dt.step("display_count")
 
     textitems = [ti for ti in textitems if ti.display_count > 0]
@@ -0,0 +1,129 @@
+"""
+Process-wide registry of multiword term indexers, one per language.
+
+Building an indexer requires loading every multiword term for the
+language, which is slow for large vocabularies.  The indexers are
+therefore built once, and then kept up to date as multiword Terms
+are saved and deleted.
+
+Changes are tracked with ORM events, and applied to the indexers when
+the session commits (see lute.db.pending_changes).  Code changing
+terms or languages with raw SQL (e.g. "delete from languages") must
+call invalidate().
+"""
+
+import threading
+from sqlalchemy import event, inspect, text as sqltext
+from lute.db import pending_changes
+from lute.models.term import Term
+from lute.models.language import Language
+from lute.read.render.token_trie import TokenTrieIndexer
+
+_lock = threading.Lock()
+
+# Language id => TokenTrieIndexer.
+_indexers = {}
+
+# Name of the changes in lute.db.pending_changes.
+_CHANGES = "multiword_registry"
+
+
+def _load_indexer(session, language_id):
+    "Build indexer loaded with all multiword terms."
+    sql = sqltext(
+        """
+        SELECT WoTextLC FROM words
+        WHERE WoLgID=:language_id and WoTokenCount>1
+        """
+    )
+    sql = sql.bindparams(language_id=language_id)
+    mw = TokenTrieIndexer()
+    for r in session.execute(sql).all():
+        mw.add(r[0])
+    return mw
+
+
+def get_indexer(session, language):
+    "Get the indexer for the language, building it if needed."
+    if language.id is None:
+        # Unsaved language, can't have any saved terms.
+        return TokenTrieIndexer()
+    with _lock:
+        # Load while holding the lock, so that no committed changes
+        # are missed while the indexer is being built.
+        mw = _indexers.get(language.id)
+        if mw is None:
+            mw = _load_indexer(session, language.id)
+            _indexers[language.id] = mw
+        return mw
+
+
+def invalidate(language_id=None):
+    """
+    Drop the indexer for the language, or for all languages if
+    language_id is None.  It will be rebuilt when next needed.
+    """
+    with _lock:
+        if language_id is None:
+            _indexers.clear()
+        else:
+            _indexers.pop(language_id, None)
+
+
+def _apply_changes(changes):
+    "Apply pending (action, language_id, text_lc) changes."
+    with _lock:
+        for action, language_id, text_lc in changes:
+            if action == "invalidate":
+                _indexers.pop(language_id, None)
+                continue
+            mw = _indexers.get(language_id)
+            if mw is None:
+                # Not loaded yet, will be correct when loaded.
+                continue
+            if action == "add":
+                mw.add(text_lc)
+            else:
+                mw.remove(text_lc)
+
+
+pending_changes.register(_CHANGES, _apply_changes)
+
+
+## ORM events.
+
+
+def _add_pending(target, action, text_lc):
+    "Record change, to apply on commit."
+    pending_changes.add(target, _CHANGES, (action, target.language_id, text_lc))
+
+
+@event.listens_for(Term, "after_insert")
+def _term_inserted(mapper, connection, target):  # pylint: disable=unused-argument
+    if (target.token_count or 0) > 1:
+        _add_pending(target, "add", target.text_lc)
+
+
+@event.listens_for(Term, "after_update")
+def _term_updated(mapper, connection, target):  # pylint: disable=unused-argument
+    # Saved terms can only change their text case, so the text_lc
+    # shouldn't change ... but handle it anyway.
+    hist = inspect(target).attrs.text_lc.history
+    if not hist.has_changes():
+        return
+    for old in hist.deleted:
+        _add_pending(target, "remove", old)
+    if (target.token_count or 0) > 1:
+        _add_pending(target, "add", target.text_lc)
+
+
+@event.listens_for(Term, "before_delete")
+def _term_deleted(mapper, connection, target):  # pylint: disable=unused-argument
+    if (target.token_count or 0) > 1:
+        _add_pending(target, "remove", target.text_lc)
+
+
+@event.listens_for(Language, "after_delete")
+def _language_deleted(mapper, connection, target):  # pylint: disable=unused-argument
+    # The language's terms are deleted by db cascade, not the ORM.
+    pending_changes.add(target, _CHANGES, ("invalidate", target.id, None))
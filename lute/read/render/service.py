@@ -4,23 +4,40 @@ Reading rendering helpers.
 
 import itertools
 import re
-from sqlalchemy import text as sqltext
 
+from sqlalchemy.orm import selectinload
 from lute.models.term import Term
-from lute.parse.base import ParsedToken
+from lute.models.repositories import TermRepository
 from lute.read.render.calculate_textitems import get_textitems as calc_get_textitems
-from lute.read.render.multiword_indexer import MultiwordTermIndexer
+from lute.read.render import multiword_registry
+from lute.instrumentation.service import timer
+from lute.instrumentation.profiling import profiled
 
 # from lute.utils.debug_helpers import DebugTimer
 
 
+# Loader options for Terms whose details (parents, tags, flash
+# message) are shown, e.g. in term popups.  Without these, each Term
+# loads each relationship with its own query.  Parents' own parents
+# and tags are shown too.  (Term.images is always eager loaded.)
+TERM_DETAILS_LOAD_OPTIONS = (
+    selectinload(Term.parents).options(
+        selectinload(Term.parents),
+        selectinload(Term.term_tags),
+        selectinload(Term.term_flash_message),
+    ),
+    selectinload(Term.term_tags),
+    selectinload(Term.term_flash_message),
+)
+
+
 class Service:
     "Service."
 
     def __init__(self, session):
         self.session = session
 
-    def find_all_Terms_in_string(self, s, language):  # pylint: disable=too-many-locals
+    def find_all_Terms_in_string(self, s, language, load_options=()):
         """
         Find all terms contained in the string s.
 
@@ -29,66 +46,17 @@ class Service:
         - given terms in the db: [ "cat", "a cat", "dog" ]
 
         This would return the terms "cat" and "a cat".
+
+        load_options are applied to the Term query, e.g.
+        TERM_DETAILS_LOAD_OPTIONS.
         """
         cleaned = re.sub(r" +", " ", s)
         tokens = language.get_parsed_tokens(cleaned)
-        return self._find_all_terms_in_tokens(tokens, language)
-
-    def _get_multiword_terms(self, language):
-        "Get all multiword terms."
-        sql = sqltext(
-            """
-            SELECT WoID, WoTextLC FROM words
-            WHERE WoLgID=:language_id and WoTokenCount>1
-            """
+        return self._find_all_terms_in_tokens(
+            tokens, language, load_options=load_options
         )
-        sql = sql.bindparams(language_id=language.id)
-        return self.session.execute(sql).all()
 
-    def _find_all_multi_word_term_text_lcs_in_content(self, text_lcs, language):
-        "Find multiword terms, return list of text_lcs."
-
-        # There are a few ways of finding multi-word Terms
-        # (with token_count > 1) in the content:
-        #
-        # 1. load each mword term text_lc via sql and check.
-        # 2. using the model
-        # 3. SQL with "LIKE"
-        #
-        # During reasonable test runs with my data, the times in seconds
-        # for each are similar (~0.02, ~0.05, ~0.025).  This method is
-        # only used for small amounts of data, and the user experience hit
-        # is negligible, so I'll use the first method which IMO is the clearest
-        # code.
-
-        zws = "\u200B"  # zero-width space
-        content = zws + zws.join(text_lcs) + zws
-
-        # Method 1:
-        reclist = self._get_multiword_terms(language)
-        return [p[1] for p in reclist if f"{zws}{p[1]}{zws}" in content]
-
-        ## # Method 2: use the model.
-        ## contained_term_qry = self.session.query(Term).filter(
-        ##     Term.language == language,
-        ##     Term.token_count > 1,
-        ##     func.instr(content, Term.text_lc) > 0,
-        ## )
-        ## return [r.text_lc for r in contained_term_qry.all()]
-
-        ## # Method 3: Query with LIKE
-        ## sql = sqltext(
-        ##     """
-        ##     SELECT WoTextLC FROM words
-        ##     WHERE WoLgID=:lid and WoTokenCount>1
-        ##     AND :content LIKE '%' || :zws || WoTextLC || :zws || '%'
-        ##     """
-        ## )
-        ## sql = sql.bindparams(lid=language.id, content=content, zws=zws)
-        ## recs = self.session.execute(sql).all()
-        ## return [r[0] for r in recs]
-
-    def _find_all_terms_in_tokens(self, tokens, language, kwtree=None):
+    def _find_all_terms_in_tokens(self, tokens, language, kwtree=None, load_options=()):
         """
         Find all terms contained in the (ordered) parsed tokens tokens.
 
@@ -119,71 +87,67 @@ class Service:
 
         # Step 1: get the multiwords in the content.
         if kwtree is None:
-            mword_terms = self._find_all_multi_word_term_text_lcs_in_content(
-                text_lcs, language
-            )
-        else:
-            results = kwtree.search_all(text_lcs)
-            mword_terms = [r[0] for r in results]
+            kwtree = self.get_multiword_indexer(language)
+        results = kwtree.search_all(text_lcs)
+        mword_terms = [r[0] for r in results]
         # dt.step("filtered mword terms")
 
         # Step 2: load the Term objects.
         #
         # The Term fetch is actually performant -- there is no
         # real difference between loading the Term objects versus
-        # loading raw data with SQL and getting dicts.
-        #
-        # Code for getting raw data:
-        # param_keys = [f"w{i}" for i, _ in enumerate(text_lcs)]
-        # keys_placeholders = ','.join([f":{k}" for k in param_keys])
-        # param_dict = dict(zip(param_keys, text_lcs))
-        # param_dict["langid"] = language.id
-        # sql = sqltext(f"""SELECT WoID, WoTextLC FROM words
-        #     WHERE WoLgID=:langid and WoTextLC in ({keys_placeholders})""")
-        # sql = sql.bindparams(language.id, *text_lcs)
-        # results = self.session.execute(sql, param_dict).fetchall()
+        # loading raw data with SQL and getting dicts.  The strings
+        # are passed as a single parameter (see TermRepository),
+        # which matters for big pages.
         text_lcs.extend(mword_terms)
-        tok_strings = list(set(text_lcs))
-        terms_matching_tokens_qry = self.session.query(Term).filter(
-            Term.text_lc.in_(tok_strings), Term.language == language
-        )
-        all_terms = terms_matching_tokens_qry.all()
+        repo = TermRepository(self.session)
+        all_terms = repo.find_all_by_text_lcs(language.id, text_lcs, load_options)
         # dt.step("exec query")
 
         return all_terms
 
-    def get_textitems(self, s, language, multiword_term_indexer=None):
+    @profiled
+    def get_textitems(self, s, language, multiword_term_indexer=None, tokens=None):
         """
         Get array of TextItems for the string s.
 
-        The multiword_term_indexer is a big performance boost, but takes
-        time to initialize.
-        """
-        # Hacky reset of state of ParsedToken state.
-        # _Shouldn't_ be needed but doesn't hurt, even if it's lame.
-        ParsedToken.reset_counters()
+        If no multiword_term_indexer is given, the language's
+        shared indexer is used.
 
+        tokens are the already-parsed tokens of s with runs of spaces
+        collapsed (e.g. from Text.get_parsed_tokens()), if available.
+        """
+        if multiword_term_indexer is None:
+            multiword_term_indexer = self.get_multiword_indexer(language)
         cleaned = re.sub(r" +", " ", s)
-        tokens = language.get_parsed_tokens(cleaned)
-        terms = self._find_all_terms_in_tokens(tokens, language, multiword_term_indexer)
-        textitems = calc_get_textitems(tokens, terms, language, multiword_term_indexer)
+        if tokens is None:
+            with timer("parse"):
+                tokens = language.get_parsed_tokens(cleaned)
+        with timer("textitems"):
+            terms = self._find_all_terms_in_tokens(
+                tokens, language, multiword_term_indexer
+            )
+            textitems = calc_get_textitems(
+                tokens, terms, language, multiword_term_indexer
+            )
         return textitems
 
     def get_multiword_indexer(self, language):
-        "Return indexer loaded with all multiword terms."
-        mw = MultiwordTermIndexer()
-        for r in self._get_multiword_terms(language):
-            mw.add(r[1])
-        return mw
+        """
+        Return indexer loaded with all multiword terms.
+
+        The indexer is shared (see multiword_registry), and is kept
+        up to date as terms are saved and deleted.
+        """
+        return multiword_registry.get_indexer(self.session, language)
 
-    def get_paragraphs(self, s, language):
+    def get_paragraphs(self, s, language, tokens=None):
         """
         Get array of arrays of TextItems for the given string s.
 
-        This doesn't use an indexer, as it should only be used
-        for a single page of text!
+        tokens are as for get_textitems().
         """
-        textitems = self.get_textitems(s, language)
+        textitems = self.get_textitems(s, language, tokens=tokens)
 
         def _split_textitems_by_paragraph(textitems):
             "Split by ¶"
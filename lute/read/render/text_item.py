@@ -11,8 +11,26 @@ class TextItem:  # pylint: disable=too-many-instance-attributes
 
     Some elements are lazy loaded, because they're only needed in
     certain situations.
+
+    Uses __slots__, as get_textitems creates (and discards) many
+    of these for every page.
     """
 
+    __slots__ = (
+        "index",
+        "lang_id",
+        "text",
+        "text_lc",
+        "is_word",
+        "token_count",
+        "display_count",
+        "sentence_number",
+        "paragraph_number",
+        "wo_status",
+        "_term",
+        "_extra_html_classes",
+    )
+
     def __init__(self, term=None):
         self.index: int
         self.lang_id: int
@@ -33,7 +51,8 @@ class TextItem:  # pylint: disable=too-many-instance-attributes
         # Calls setter
         self.term = term
 
-        self.extra_html_classes = []
+        # Only created if needed, most items don't have any.
+        self._extra_html_classes = None
 
         # TODO code
         # # The flash message can be None, so we need an extra flag
@@ -80,9 +99,21 @@ class TextItem:  # pylint: disable=too-many-instance-attributes
     #     self._flash_message_loaded = True
     #     return self._flash_message
 
+    @property
+    def extra_html_classes(self):
+        "Extra classes added with add_html_class."
+        return self._extra_html_classes or []
+
+    @property
+    def is_overlapped(self):
+        "True if some of the textitem is covered by another."
+        return self.display_count != self.token_count
+
     @property
     def display_text(self):
         "Show last n tokens, if some of the textitem is covered."
+        if not self.is_overlapped:
+            return self.text
         toks = self.text.split(zws)
         disp_toks = toks[-self.display_count :]
         return zws.join(disp_toks)
@@ -110,7 +141,9 @@ class TextItem:  # pylint: disable=too-many-instance-attributes
 
     def add_html_class(self, c):
         "Add extra class to term."
-        self.extra_html_classes.append(c)
+        if self._extra_html_classes is None:
+            self._extra_html_classes = []
+        self._extra_html_classes.append(c)
 
     @property
     def html_class_string(self):
@@ -127,8 +160,9 @@ class TextItem:  # pylint: disable=too-many-instance-attributes
             "word" + str(self.wo_id),
         ]
 
-        if self.display_text != self.text:
+        if self.is_overlapped:
             classes.append("overlapped")
-        classes.extend(self.extra_html_classes)
+        if self._extra_html_classes is not None:
+            classes.extend(self._extra_html_classes)
 
         return " ".join(classes)
@@ -0,0 +1,101 @@
+"""
+Find multiword terms in lists of tokens using a trie.
+
+This never builds a big zws-joined string of the tokens: the trie is
+keyed by each token's lowercase text, and is walked along the
+lowercase tokens.  The cost of a search therefore depends on the
+number of tokens, not characters.
+"""
+
+import threading
+
+zws = "\u200B"  # zero-width space
+
+# Key in a trie node for the term ending at that node.  Tokens are
+# strings, so this can't collide with them.
+_TERM = None
+
+
+class TokenTrieIndexer:
+    """
+    Trie of multiword terms, keyed by token.
+
+    Adding and removing terms only touches the nodes for that term.
+    """
+
+    def __init__(self):
+        self.root = {}
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, t):
+        node = self.root
+        for tok in t.split(zws):
+            node = node.get(tok)
+            if node is None:
+                return False
+        return _TERM in node
+
+    def add(self, t):
+        "Add zws-delimited term to the trie."
+        with self._lock:
+            node = self.root
+            for tok in t.split(zws):
+                node = node.setdefault(tok, {})
+            if _TERM not in node:
+                node[_TERM] = t
+                self.count += 1
+
+    def remove(self, t):
+        "Remove term from the trie if present, pruning empty nodes."
+        with self._lock:
+            path = []
+            node = self.root
+            for tok in t.split(zws):
+                child = node.get(tok)
+                if child is None:
+                    return
+                path.append((node, tok))
+                node = child
+            if _TERM not in node:
+                return
+            del node[_TERM]
+            self.count -= 1
+            for parent, tok in reversed(path):
+                if len(parent[tok]) > 0:
+                    break
+                del parent[tok]
+
+    def search_all(self, lc_tokens):
+        "Find all terms and starting token index."
+        root = self.root
+        n = len(lc_tokens)
+        for i in range(n):
+            node = root.get(lc_tokens[i])
+            j = i + 1
+            while node is not None:
+                t = node.get(_TERM)
+                if t is not None:
+                    yield (t, i)
+                if j == n:
+                    break
+                node = node.get(lc_tokens[j])
+                j += 1
+
+
+def get_token_indexes(strings, tokens):
+    """
+    Returns list of arrays: [[string, index], ...]
+
+    Same as calculate_textitems.get_string_indexes, but for a list of
+    tokens rather than a zws-joined string.
+
+    strings and tokens must be lowercased!
+    """
+    trie = TokenTrieIndexer()
+    for s in strings:
+        trie.add(s)
+    return list(trie.search_all(tokens))
@@ -2,8 +2,17 @@
 /read endpoints.
 """
 
-from flask import Blueprint, flash, request, render_template, redirect, jsonify
+from flask import (
+    Blueprint,
+    current_app,
+    flash,
+    request,
+    render_template,
+    redirect,
+    jsonify,
+)
 from lute.read.service import Service
+from lute.read import prerender
 from lute.read.forms import TextForm
 from lute.term.model import Repository
 from lute.term.routes import handle_term_form
@@ -172,6 +181,19 @@ def save_player_data():
     return jsonify("ok")
 
 
+def _render_page_content(paragraphs):
+    "Render page paragraphs."
+    return render_template("read/page_content.html", paragraphs=paragraphs)
+
+
+def _page_content(book, pagenum, track_page_open):
+    "Render the page content, using cached content if available."
+    service = Service(db.session)
+    return service.get_page_content(
+        book, pagenum, track_page_open, _render_page_content
+    )
+
+
 @bp.route("/start_reading/<int:bookid>/<int:pagenum>", methods=["GET"])
 def start_reading(bookid, pagenum):
     "Called by ajax.  Update the text.start_date, and render page."
@@ -179,9 +201,15 @@ def start_reading(bookid, pagenum):
     if book is None:
         flash(f"No book matching id {bookid}")
         return redirect("/", 302)
-    service = Service(db.session)
-    paragraphs = service.start_reading(book, pagenum)
-    return render_template("read/page_content.html", paragraphs=paragraphs)
+    content = _page_content(book, pagenum, True)
+
+    # Get the next pages ready.
+    prerender_count = current_app.config.get("PRERENDER_PAGES", 0)
+    if prerender_count > 0:
+        app = current_app._get_current_object()  # pylint: disable=protected-access
+        prerender.schedule(app, book, pagenum, prerender_count, _render_page_content)
+
+    return content
 
 
 @bp.route("/refresh_page/<int:bookid>/<int:pagenum>", methods=["GET"])
@@ -191,9 +219,7 @@ def refresh_page(bookid, pagenum):
     if book is None:
         flash(f"No book matching id {bookid}")
         return redirect("/", 302)
-    service = Service(db.session)
-    paragraphs = service.get_paragraphs(book, pagenum)
-    return render_template("read/page_content.html", paragraphs=paragraphs)
+    return _page_content(book, pagenum, False)
 
 
 @bp.route("/empty", methods=["GET"])
@@ -5,16 +5,28 @@ Reading helpers.
 from collections import defaultdict
 from datetime import datetime
 import functools
+import json
+import sqlite3
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import make_transient_to_detached
 from lute.models.term import Term, Status
 from lute.models.book import Text, WordsRead
 from lute.models.repositories import BookRepository, UserSettingRepository
 from lute.book.stats import Service as StatsService
-from lute.read.render.service import Service as RenderService
+from lute.read.render.service import (
+    Service as RenderService,
+    TERM_DETAILS_LOAD_OPTIONS,
+)
 from lute.read.render.calculate_textitems import get_string_indexes
+from lute.read import page_cache
+from lute.instrumentation.service import timer
 from lute.term.model import Repository
 
 # from lute.utils.debug_helpers import DebugTimer
 
+# "insert ... returning" needs sqlite 3.35 or later.
+INSERT_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
 
 class TermPopup:
     "Popup data for a term."
@@ -98,33 +110,56 @@ class Service:
     def set_unknowns_to_known(self, text: Text):
         """
         Given a text, create new Terms with status Well-Known
-        for any new Terms.
-        """
-        rs = RenderService(self.session)
-        paragraphs = rs.get_paragraphs(text.text, text.book.language)
-        self._save_new_status_0_terms(paragraphs)
+        for any new Terms, and set any unknown (status 0) Terms
+        to Well-Known.
 
-        unknowns = [
-            ti.term
-            for para in paragraphs
-            for sentence in para
-            for ti in sentence
-            if ti.is_word and ti.term.status == 0
-        ]
+        This is done with one insert and one update statement
+        rather than through the ORM, as pages can have hundreds
+        of unknown terms.
 
-        batch_size = 100
-        i = 0
+        Returns (number of terms created, number of terms updated).
+        """
+        language = text.book.language
+        rs = RenderService(self.session)
+        textitems = rs.get_textitems(
+            text.text, language, tokens=text.get_parsed_tokens()
+        )
 
-        for t in unknowns:
+        new_terms = {}
+        unknown_text_lcs = set()
+        for ti in textitems:
+            if not ti.is_word:
+                continue
+            if ti.term.id is None:
+                new_terms[ti.term.text_lc] = ti.term
+            elif ti.term.status == Status.UNKNOWN:
+                unknown_text_lcs.add(ti.term.text_lc)
+
+        for t in new_terms.values():
             t.status = Status.WELLKNOWN
-            self.session.add(t)
-            i += 1
-            if i % batch_size == 0:
-                self.session.commit()
-
-        # Commit any remaining.
+        self._insert_terms(list(new_terms.values()))
+
+        updated = 0
+        if len(unknown_text_lcs) > 0:
+            # One json parameter rather than one per term, as for
+            # TermRepository.find_all_by_text_lcs().
+            lcs = func.json_each(json.dumps(list(unknown_text_lcs)))
+            lcs = lcs.table_valued("value")
+            stmt = (
+                update(Term)
+                .where(Term.language_id == language.id)
+                .where(Term.status == Status.UNKNOWN)
+                .where(Term.text_lc.in_(select(lcs.c.value)))
+                .values(status=Status.WELLKNOWN)
+                .execution_options(synchronize_session=False)
+            )
+            updated = self.session.execute(stmt).rowcount
         self.session.commit()
 
+        # The update isn't seen by the ORM events.
+        page_cache.bump_term_generation(language.id)
+        return (len(new_terms), updated)
+
     def bulk_status_update(self, text: Text, terms_text_array, new_status):
         """
         Given a text and list of terms, update or create new terms
@@ -138,6 +173,44 @@ class Service:
             repo.add(t)
         repo.commit()
 
+    def _insert_terms(self, new_terms):
+        """
+        Insert new Terms, and attach them to the session.
+
+        All of the terms are inserted in a single statement (one per
+        term for sqlite before 3.35), rather than adding each to the
+        session: the ORM unit of work is slow for pages with many new
+        terms.  No ORM insert events are fired, so this is only for
+        single-word terms.
+        """
+        if len(new_terms) == 0:
+            return
+        rows = [
+            {
+                "language_id": t.language.id,
+                "_text": t.text,
+                "text_lc": t.text_lc,
+                "status": t.status,
+                "romanization": t.romanization,
+                "token_count": t.token_count,
+                "sync_status": False,
+            }
+            for t in new_terms
+        ]
+        if INSERT_RETURNING:
+            # The ids are returned in row order.
+            stmt = insert(Term).returning(Term.id, sort_by_parameter_order=True)
+            ids = self.session.scalars(stmt, rows).all()
+        else:
+            ids = [
+                self.session.execute(insert(Term).values(row)).inserted_primary_key[0]
+                for row in rows
+            ]
+        for t, termid in zip(new_terms, ids):
+            t.id = termid
+            make_transient_to_detached(t)
+            self.session.add(t)
+
     def _save_new_status_0_terms(self, paragraphs):
         "Add status 0 terms for new textitems in paragraph."
         tis_with_new_terms = [
@@ -148,14 +221,18 @@ class Service:
             if ti.is_word and ti.term.id is None and ti.term.status == 0
         ]
 
-        for ti in tis_with_new_terms:
-            self.session.add(ti.term)
+        # The same new Term is shared by all TextItems with its text.
+        new_terms = list({id(ti.term): ti.term for ti in tis_with_new_terms}.values())
+        if len(new_terms) == 0:
+            return
+        self._insert_terms(new_terms)
         self.session.commit()
 
-    def _get_reading_data(self, dbbook, pagenum, track_page_open=False):
-        "Get paragraphs, set text.start_date if needed."
+    def _open_page_text(self, dbbook, pagenum, track_page_open, load_sentences=True):
+        "Get the page's text, set text.start_date if needed."
         text = dbbook.text_at_page(pagenum)
-        text.load_sentences()
+        if load_sentences:
+            text.load_sentences()
         svc = StatsService(self.session)
         svc.mark_stale(dbbook)
 
@@ -166,14 +243,23 @@ class Service:
         self.session.add(dbbook)
         self.session.add(text)
         self.session.commit()
+        return text
 
+    def _get_text_paragraphs(self, text):
+        "Get paragraphs, saving any new status 0 terms."
         lang = text.book.language
         rs = RenderService(self.session)
-        paragraphs = rs.get_paragraphs(text.text, lang)
+        with timer("parse"):
+            tokens = text.get_parsed_tokens()
+        paragraphs = rs.get_paragraphs(text.text, lang, tokens)
         self._save_new_status_0_terms(paragraphs)
-
         return paragraphs
 
+    def _get_reading_data(self, dbbook, pagenum, track_page_open=False):
+        "Get paragraphs, set text.start_date if needed."
+        text = self._open_page_text(dbbook, pagenum, track_page_open)
+        return self._get_text_paragraphs(text)
+
     def get_paragraphs(self, dbbook, pagenum):
         "Get the paragraphs for the book."
         return self._get_reading_data(dbbook, pagenum, False)
@@ -182,6 +268,36 @@ class Service:
         "Start reading a page in the book, getting paragraphs."
         return self._get_reading_data(dbbook, pagenum, True)
 
+    def get_page_content(self, dbbook, pagenum, track_page_open, render_paragraphs):
+        """
+        Get the rendered page content, from the page cache if possible.
+
+        render_paragraphs is a function that renders the page
+        paragraphs (e.g. to html) for caching.
+        """
+        text = dbbook.text_at_page(pagenum)
+        content = page_cache.get(text)
+        if content is None:
+            with page_cache.render_lock:
+                # The page may have been rendered by another thread
+                # while waiting for the lock.
+                content = page_cache.get(text)
+                if content is None:
+                    # Get the key before the terms are loaded, so that
+                    # if a term is saved during rendering, the content
+                    # is cached under the old generation and re-rendered.
+                    key = page_cache.key_for(text)
+                    text = self._open_page_text(dbbook, pagenum, track_page_open)
+                    paragraphs = self._get_text_paragraphs(text)
+                    content = render_paragraphs(paragraphs)
+                    page_cache.put(text, key, content)
+                    return content
+
+        # The text and its language haven't changed since the
+        # content was cached, so its sentences are still current.
+        self._open_page_text(dbbook, pagenum, track_page_open, False)
+        return content
+
     def _sort_components(self, term, components):
         "Sort components by min position in string and length."
         component_and_pos = []
@@ -210,7 +326,7 @@ class Service:
 
     def get_popup_data(self, termid):
         "Get popup data, or None if popup shouldn't be shown."
-        term = self.session.get(Term, termid)
+        term = self.session.get(Term, termid, options=TERM_DETAILS_LOAD_OPTIONS)
         if term is None:
             return None
 
@@ -221,7 +337,9 @@ class Service:
             rs = RenderService(self.session)
             components = [
                 c
-                for c in rs.find_all_Terms_in_string(term.text, term.language)
+                for c in rs.find_all_Terms_in_string(
+                    term.text, term.language, TERM_DETAILS_LOAD_OPTIONS
+                )
                 if c.id != term.id and c.status != Status.UNKNOWN
             ]
 
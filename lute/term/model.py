@@ -118,7 +118,7 @@ class Repository:
         """
         lang_repo = LanguageRepository(self.session)
         lang = lang_repo.find(langid)
-        return DBTerm(lang, text)
+        return DBTerm.create_spec_term(lang, text)
 
     def _find_by_spec(self, langid, text):
         "Do a search using a spec term."
@@ -282,6 +282,7 @@ class Repository:
             raise ValueError("Text not set for term")
 
         t = None
+        spec = None
         if term.id is not None:
             # This is an existing term, so use it directly.
             t = self.session.get(DBTerm, term.id)
@@ -289,10 +290,13 @@ class Repository:
             # New term, or finding by text.
             spec = self._search_spec_term(term.language_id, term.text)
             term_repo = TermRepository(self.session)
-            t = term_repo.find_by_spec(spec) or DBTerm()
-            t.language = spec.language
+            t = term_repo.find_by_spec(spec)
+            if t is None:
+                # The new term's text is already parsed in the spec.
+                t = spec
 
-        t.text = term.text
+        if t is not spec:
+            t.text = term.text
         t.original_text = term.text
         t.status = term.status
         t.translation = term.translation
@@ -441,7 +445,7 @@ class ReferencesRepository:
         """
         lang_repo = LanguageRepository(self.session)
         lang = lang_repo.find(langid)
-        return DBTerm(lang, text)
+        return DBTerm.create_spec_term(lang, text)
 
     def find_references(self, term):
         """
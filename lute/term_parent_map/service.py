@@ -2,6 +2,7 @@
 Term parent mapping.
 """
 
+from lute.models.book import Text
 from lute.models.term import Term
 
 
@@ -20,8 +21,8 @@ class Service:
         lang = book.language
         unique_tokens = {
             t
-            for txt in book.texts
-            for t in lang.get_parsed_tokens(txt.text)
+            for toks in Text.get_all_parsed_tokens(book.texts)
+            for t in toks
             if t.is_word
         }
         unique_lcase_toks = {lang.get_lowercase(t.token) for t in unique_tokens}
@@ -35,6 +35,11 @@ class KhmerParser(AbstractParser):
     #     "Set up necessary files."
     #     pass
 
+    @classmethod
+    def warm_up(cls):
+        "Load the khmernltk model, which is done on first use."
+        khmernltk.word_tokenize("សួស្តី")
+
     def _handle_special_token(self, token: str, special_char: str) -> List[str]:
         """
         Handle special token scenarios by replacing all special tokens with newline characters.
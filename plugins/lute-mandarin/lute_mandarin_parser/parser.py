@@ -26,6 +26,9 @@ class MandarinParser(AbstractParser):
     data file.
     """
 
+    # ((exceptions file path, file signature), exceptions map)
+    _exceptions_cache = None
+
     @classmethod
     def name(cls):
         return "Lute Mandarin Chinese"
@@ -83,6 +86,42 @@ class MandarinParser(AbstractParser):
                 ret[orig_token] = parts
         return ret
 
+    @classmethod
+    def _exceptions_file_signature(cls):
+        "Path, mtime and size of the exceptions file, to detect changes."
+        fp = cls.parser_exceptions_file()
+        try:
+            st = os.stat(fp)
+        except OSError:
+            return None
+        return (fp, st.st_mtime_ns, st.st_size)
+
+    @classmethod
+    def _get_parser_exceptions_map(cls):
+        "The exceptions map, only re-read if the file has changed."
+        if cls.data_directory is None:
+            return {}
+        sig = cls._exceptions_file_signature()
+        cached = cls._exceptions_cache
+        if sig is not None and cached is not None and cached[0] == sig:
+            return cached[1]
+        ret = cls._build_parser_exceptions_map()
+        cls._exceptions_cache = (sig, ret)
+        return ret
+
+    @classmethod
+    def data_version(cls):
+        "Cached tokens are stale if the exceptions file changes."
+        if cls.data_directory is None:
+            return ""
+        return str(cls._exceptions_file_signature())
+
+    @classmethod
+    def warm_up(cls):
+        "Load the jieba dictionary and exceptions, done on first use."
+        jieba.initialize()
+        cls._get_parser_exceptions_map()
+
     def _reparse_with_exceptions_map(self, original_token, exceptions_map):
         "Check the token s against the map, break down further if needed."
 
@@ -103,7 +142,7 @@ class MandarinParser(AbstractParser):
         Returns ParsedToken array for given language.
         """
 
-        exceptions_map = self._build_parser_exceptions_map()
+        exceptions_map = self._get_parser_exceptions_map()
 
         # Ensure standard carriage returns so that paragraph
         # markers are used correctly.  Lute uses paragraph markers
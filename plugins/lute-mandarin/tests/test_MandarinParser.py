@@ -151,3 +151,18 @@ def test_term_found_in_exceptions_file_is_split(mandarin_chinese, _datadir):
 
     set_parse_exceptions(["清华, 大学", " 大 ,  学 "])
     assert ["清华", "大", "学"] == parsed_tokens(), "Spaces are ignored"
+
+
+def test_exceptions_map_only_reread_if_file_changes(_datadir):
+    "The map is cached until the file's mtime or size changes."
+    # pylint: disable=protected-access
+    m = MandarinParser._get_parser_exceptions_map()
+    assert MandarinParser._get_parser_exceptions_map() is m, "cached"
+    v = MandarinParser.data_version()
+
+    with open(MandarinParser.parser_exceptions_file(), "a", encoding="utf8") as ef:
+        ef.write("清华,大学\n")
+    m2 = MandarinParser._get_parser_exceptions_map()
+    assert m2 is not m, "reread"
+    assert m2["清华大学"] == ["清华", "大学"]
+    assert MandarinParser.data_version() != v, "cached tokens are stale"
@@ -38,6 +38,11 @@ class ThaiParser(AbstractParser):
     #     "Set up necessary files."
     #     pass
 
+    @classmethod
+    def warm_up(cls):
+        "Load the pythainlp dictionary, which is done on first use."
+        pythainlp.word_tokenize("สวัสดี")
+
     def get_parsed_tokens(self, text: str, language) -> List[ParsedToken]:
         """
         Returns ParsedToken array for given language.
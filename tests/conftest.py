@@ -9,6 +9,7 @@ import pytest
 from lute.config.app_config import AppConfig
 from lute.db import db
 import lute.db.management
+from lute.parse import space_delimited_parser
 from lute.language.service import Service
 from lute.app_factory import create_app
 
@@ -25,7 +26,8 @@ def pytest_sessionstart(session):  # pylint: disable=unused-argument
 
     DATAPATH must be specified: this ensures that the tests don't
     accidentally write into the user_data (which could mess with prod
-    data/media etc)
+    data/media etc).  Cached data is written there too, rather than
+    in the user cache dir.
     """
     thisdir = os.path.dirname(os.path.realpath(__file__))
     configfile = os.path.join(thisdir, "..", "lute", "config", "config.yml")
@@ -46,6 +48,8 @@ def pytest_sessionstart(session):  # pylint: disable=unused-argument
         msg = f"Bad config.yml: {', '.join(failures)}"
         pytest.exit(msg)
 
+    space_delimited_parser.WORD_CHARACTERS_CACHE_DIR = ac.cachepath
+
 
 @pytest.fixture(name="testconfig")
 def fixture_config():
@@ -5,10 +5,15 @@ Tests lute.term.model.Book *domain* objects being saved
 and retrieved from DB.
 """
 
+import re
 import pytest
 
 from lute.db import db
 from lute.book.model import Book, Repository
+from lute.models.book import Text
+from lute.parse.base import ParsedToken
+from lute.parse.space_delimited_parser import SpaceDelimitedParser
+import lute.parse.registry
 from tests.dbasserts import assert_sql_result
 
 
@@ -161,6 +166,85 @@ def test_split_by_paragraphs_scenario(
     assert "/".join(actuals) == "/".join(expected), f"scen {threshold}, {fulltext}"
 
 
+def _token_data(tokens):
+    return [(t.token, t.is_word, t.is_end_of_sentence) for t in tokens]
+
+
+def test_new_book_pages_use_fulltext_tokens(app_context, repo, english, monkeypatch):
+    "The pages aren't parsed again, they get their tokens from the fulltext."
+    b = Book()
+    b.title = "Hola"
+    b.language_id = english.id
+    b.text = "Here is a dog. And a cat.\n---\nHere is a cat.\nAnd a dog."
+    b.threshold_page_tokens = 3
+    b.split_by = "sentences"
+
+    calls = []
+    real_parse = SpaceDelimitedParser.get_parsed_tokens
+
+    def _counting_parse(self, text, language):
+        calls.append(text)
+        return real_parse(self, text, language)
+
+    monkeypatch.setattr(SpaceDelimitedParser, "get_parsed_tokens", _counting_parse)
+    dbbook = repo.add(b)
+    assert len(dbbook.texts) == 4, "sanity check"
+    assert len(calls) == 2, "only the page break segments are parsed"
+
+    monkeypatch.setattr(SpaceDelimitedParser, "get_parsed_tokens", real_parse)
+    for t in dbbook.texts:
+        saved = t._saved_tokens()  # pylint: disable=protected-access
+        assert saved is not None, "saved"
+        expected = english.get_parsed_tokens(t.text)
+        assert _token_data(t.get_parsed_tokens()) == _token_data(expected), t.text
+
+
+class SpacesKeptParser(SpaceDelimitedParser):
+    "Parser that keeps runs of spaces, as jieba does."
+
+    @classmethod
+    def name(cls):
+        return "Spaces kept"
+
+    def get_parsed_tokens(self, text, language):
+        ret = []
+        for s in re.findall(r"\w+| +|\n|[^\w \n]+", text):
+            if s == "\n":
+                ret.append(ParsedToken("¶", False, True))
+            else:
+                ret.append(ParsedToken(s, s[0].isalnum(), "." in s))
+        return ret
+
+
+def test_new_book_with_runs_of_spaces_saves_tokens_for_text(
+    app_context, repo, english, monkeypatch
+):
+    "The saved tokens are for the text as it's parsed, with spaces collapsed."
+    monkeypatch.setitem(
+        lute.parse.registry.__LUTE_PARSERS__, "spaces", SpacesKeptParser
+    )
+    english.parser_type = "spaces"
+    b = Book()
+    b.title = "Hola"
+    b.language_id = english.id
+    b.text = "Here  is a dog.  And a cat.\nNew  paragraph."
+    b.threshold_page_tokens = 3
+    b.split_by = "paragraphs"
+    dbbook = repo.add(b)
+    assert [t.text for t in dbbook.texts] == [
+        "Here  is a dog.  And a cat.",
+        "New  paragraph.",
+    ], "text unchanged"
+
+    parser = SpacesKeptParser()
+    for t in dbbook.texts:
+        saved = t._saved_tokens()  # pylint: disable=protected-access
+        assert saved is not None, "key matches"
+        expected = parser.get_parsed_tokens(Text.text_to_parse(t.text), english)
+        assert _token_data(saved) == _token_data(expected), t.text
+        assert "  " not in "".join(tok.token for tok in saved)
+
+
 def test_get_tags(app_context, new_book, repo):
     "Helper method test."
     assert repo.get_book_tags() == [], "no tags yet"
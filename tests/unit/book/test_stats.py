@@ -6,6 +6,7 @@ import pytest
 from sqlalchemy.sql import text
 
 from lute.db import db
+from lute.parse import parallel
 from lute.term.model import Term, Repository
 from lute.book.stats import Service
 
@@ -140,6 +141,21 @@ def test_cache_loads_when_prompted(service, _test_book):
     assert_record_count_equals("bookstats", 1, "loaded")
 
 
+def test_refresh_stats_never_parses_in_process_pool(service, _test_book, monkeypatch):
+    "Stats are refreshed during requests, so the texts are parsed in process."
+    monkeypatch.setattr(parallel, "_worker_count", lambda parser, texts: 2)
+
+    def _no_pool(*args):
+        raise AssertionError("process pool used")
+
+    monkeypatch.setattr(parallel, "_parse_in_pool", _no_pool)
+    for t in _test_book.texts:
+        t._packed_tokens = None  # pylint: disable=protected-access
+    db.session.commit()
+    service.refresh_stats()
+    assert_record_count_equals("bookstats", 1, "loaded")
+
+
 def test_stats_smoke_test(service, _test_book, spanish):
     "Terms are rendered to count stats."
     add_terms(spanish, ["gato", "TENGO"])
@@ -25,6 +25,7 @@ def test_valid_config(tmp_path):
     app_config = AppConfig(config_file)
     assert app_config.datapath == "data_path"
     assert app_config.sqliteconnstring == "sqlite:///data_path/my_db"
+    assert app_config.cachepath == "data_path/cache"
     assert app_config.env == "dev"
 
 
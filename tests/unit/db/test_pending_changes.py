@@ -0,0 +1,36 @@
+"""
+Pending changes tests.
+"""
+
+from lute.db import db, pending_changes
+from lute.models.term import Term
+
+
+def test_changes_applied_on_commit_and_dropped_on_rollback(spanish, app_context):
+    "Callback gets the changes added since the last commit or rollback."
+    applied = []
+    pending_changes.register("test", applied.append)
+
+    t = Term(spanish, "gato")
+    db.session.add(t)
+    pending_changes.add(t, "test", "a")
+    pending_changes.add(t, "test", "b")
+    assert not applied, "not committed"
+    db.session.commit()
+    assert applied == [["a", "b"]], "applied on commit"
+
+    t.translation = "cat"
+    db.session.flush()
+    pending_changes.add(t, "test", "c")
+    db.session.rollback()
+    db.session.commit()
+    assert applied == [["a", "b"]], "rolled-back change dropped"
+
+
+def test_change_for_object_without_session_is_ignored(spanish, app_context):
+    "Nothing to commit, so nothing is recorded."
+    applied = []
+    pending_changes.register("test", applied.append)
+    pending_changes.add(Term(spanish, "gato"), "test", "a")
+    db.session.commit()
+    assert not applied
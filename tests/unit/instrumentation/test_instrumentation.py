@@ -0,0 +1,79 @@
+"""
+Request instrumentation tests.
+"""
+
+import pytest
+import yaml
+
+from lute.config.app_config import AppConfig
+from lute.app_factory import create_app
+from lute.book.model import Book, Repository
+from lute.instrumentation import service
+from lute.db import db
+
+
+@pytest.fixture(name="instrumented_client")
+def fixture_instrumented_client(app, tmp_path):  # pylint: disable=unused-argument
+    "Client for an app using the test config, with instrumentation on."
+    with open(AppConfig.default_config_filename(), "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    config["INSTRUMENT_REQUESTS"] = True
+    config_file = tmp_path / "config.yml"
+    with open(config_file, "w", encoding="utf-8") as f:
+        yaml.dump(config, f)
+
+    service.clear()
+    instrumented_app = create_app(config_file, extra_config={"TESTING": True})
+    yield instrumented_app.test_client()
+    service.clear()
+
+
+def test_timer_does_nothing_outside_of_requests():
+    "Safe to use anywhere."
+    with service.timer("parse"):
+        pass
+    assert service.current_timings() is None
+
+
+def test_not_enabled_by_default(client):
+    "No header or endpoint unless configured."
+    response = client.get("/")
+    assert "Server-Timing" not in response.headers
+    assert client.get("/instrumentation/").status_code == 404
+
+
+def test_server_timing_header(instrumented_client):
+    "Sql count and timings are in the header."
+    response = instrumented_client.get("/")
+    header = response.headers["Server-Timing"]
+    assert "sql;dur=" in header
+    assert "queries" in header
+    assert "render;dur=" in header
+    assert "total;dur=" in header
+
+
+def test_totals_by_route(instrumented_client, english, app_context):
+    "Reading a page records parse and render time for the route."
+    b = Book()
+    b.title = "blah"
+    b.language_id = english.id
+    b.text = "Dog CAT dog cat."
+    dbbook = Repository(db.session).add(b)
+    db.session.commit()
+
+    instrumented_client.get("/")
+    instrumented_client.get("/")
+    instrumented_client.get(f"/read/start_reading/{dbbook.id}/1")
+
+    totals = instrumented_client.get("/instrumentation/").json
+    assert totals["/"]["requests"] == 2
+    assert totals["/"]["queries"] > 0
+
+    read_totals = totals["/read/start_reading/<int:bookid>/<int:pagenum>"]
+    assert read_totals["requests"] == 1
+    assert "parse" in read_totals["steps_ms"]
+    assert "render" in read_totals["steps_ms"]
+
+    instrumented_client.get("/instrumentation/clear")
+    totals = instrumented_client.get("/instrumentation/").json
+    assert list(totals.keys()) == ["/instrumentation/clear"]
@@ -0,0 +1,98 @@
+"""
+Request profiling tests.
+"""
+
+import pstats
+import threading
+from flask import Flask, g
+
+from lute.instrumentation import profiling
+
+
+@profiling.profiled
+def _outer():
+    return _inner() + 1
+
+
+@profiling.profiled
+def _inner():
+    return 41
+
+
+def _make_app(threshold_ms, outdir):
+    "Flask app with routes calling the profiled functions."
+    app = Flask(__name__)
+    profiling.init_app(app, threshold_ms, outdir)
+
+    @app.route("/answer/<int:n>")
+    def answer(n):
+        return str(_outer() + n)
+
+    @app.route("/unprofiled")
+    def unprofiled():
+        return "hi"
+
+    return app
+
+
+def test_profiled_function_works_outside_of_requests():
+    "Nothing is profiled, the function is just called."
+    assert _outer() == 42
+
+
+def test_slow_request_profile_is_saved(tmp_path):
+    "Profile includes the nested calls, file name has the route."
+    client = _make_app(0, tmp_path).test_client()
+    assert client.get("/answer/1").data == b"43"
+    files = list(tmp_path.iterdir())
+    assert len(files) == 1
+    assert "_answer_int_n_" in files[0].name
+    assert files[0].name.endswith("ms.prof")
+    funcnames = [k[2] for k in pstats.Stats(str(files[0])).stats]
+    assert "_outer" in funcnames
+    assert "_inner" in funcnames
+
+
+def test_fast_requests_not_saved(tmp_path):
+    "Only requests slower than the threshold are saved."
+    client = _make_app(60000, tmp_path).test_client()
+    assert client.get("/answer/1").data == b"43"
+    assert not list(tmp_path.iterdir())
+
+
+def test_nothing_saved_if_nothing_profiled(tmp_path):
+    "Requests not calling profiled functions aren't saved."
+    client = _make_app(0, tmp_path).test_client()
+    client.get("/unprofiled")
+    assert not list(tmp_path.iterdir())
+
+
+def test_concurrent_requests_only_one_profiled(tmp_path):
+    "Only one profiler can be enabled, other requests aren't profiled."
+    # pylint: disable=protected-access
+    app = _make_app(0, tmp_path)
+    both_running = threading.Barrier(2, timeout=5)
+
+    @profiling.profiled
+    def _wait_for_other():
+        both_running.wait()
+        return 42
+
+    profilers = []
+    results = []
+
+    def _request():
+        with app.test_request_context("/"):
+            profiling._start_request()
+            results.append(_wait_for_other())
+            profilers.append(g.lute_profiler)
+
+    threads = [threading.Thread(target=_request) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == [42, 42]
+    assert sorted(bool(p.getstats()) for p in profilers) == [False, True]
+    assert not profiling._active.locked(), "released"
@@ -4,6 +4,7 @@ Language model tests - getting, saving, etc.
 Low value but ensure that the db mapping is correct.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from lute.db import db
 from lute.db.demo import Service as DemoService
 from lute.models.language import Language
@@ -96,3 +97,32 @@ def test_lang_to_dict_from_dict_returns_same_thing(app_context):
     e_from_dict = Language.from_dict(e_dict)
     e_back_to_dict = e_from_dict.to_dict()
     assert e_dict == e_back_to_dict, "Same thing returned"
+
+
+def _numbering(tokens):
+    "Order and sentence number of each token."
+    return [f"{t.order}.{t.sentence_number}" for t in tokens]
+
+
+def test_parsed_tokens_are_numbered_per_call():
+    "Numbering always starts from the beginning, independent of other parses."
+    lang = Language()
+    toks = lang.get_parsed_tokens("Hi there. Bye.")
+    expected = ["1.0", "2.0", "3.0", "4.0", "5.1", "6.1"]
+    assert _numbering(toks) == expected
+
+    lang.get_parsed_tokens("Some other text. With sentences.")
+    assert _numbering(lang.get_parsed_tokens("Hi there. Bye.")) == expected
+
+
+def test_concurrent_parses_do_not_share_numbering():
+    "Parses in different threads get the same numbering."
+    lang = Language()
+    text = "One two. Three four. Five six. " * 200
+    expected = _numbering(lang.get_parsed_tokens(text))
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(
+            executor.map(lambda _: _numbering(lang.get_parsed_tokens(text)), range(8))
+        )
+    for r in results:
+        assert r == expected
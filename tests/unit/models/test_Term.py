@@ -93,6 +93,27 @@ def test_find_by_spec(app_context, spanish, english):
     assert found is None, "not found with different text"
 
 
+def test_find_all_by_text_lcs(app_context, spanish, english):
+    "Finds terms in the language matching any of the text_lcs."
+    for lang, s in [(spanish, "gato"), (spanish, "perro"), (english, "gato")]:
+        db.session.add(Term(lang, s))
+    db.session.add(Term(spanish, "un gato"))
+    db.session.commit()
+
+    repo = TermRepository(db.session)
+    zws = "\u200B"
+    lcs = ["gato", "perro", "gato", "nada", f"un{zws} {zws}gato"]
+    found = repo.find_all_by_text_lcs(spanish.id, lcs)
+    expected = ["gato", "perro", "un/ /gato"]
+    assert sorted(t.text_lc.replace(zws, "/") for t in found) == expected
+    assert all(t.language_id == spanish.id for t in found)
+
+    assert repo.find_all_by_text_lcs(spanish.id, []) == []
+
+    many = [f"x{i}" for i in range(50000)] + ["perro"]
+    assert [t.text for t in repo.find_all_by_text_lcs(spanish.id, many)] == ["perro"]
+
+
 # WoStatusChanged checks.
 #
 # Saving a term changes WoStatusChanged date, via a db trigger.
@@ -261,3 +282,20 @@ def test_changing_status_of_status_0_term_resets_WoCreated(app_context, spanish)
     current_year = str(datetime.datetime.now().year)
     sql_updated = "select strftime('%Y', WoCreated) from words"
     assert_sql_result(sql_updated, [f"{current_year}"], "final")
+
+
+def test_create_terms_no_parsing_gets_readings_in_one_call(spanish, monkeypatch):
+    "The parser is asked for all the readings at once."
+    calls = []
+
+    def fake_readings(_, texts):
+        calls.append(texts)
+        return [f"r-{t}" for t in texts]
+
+    monkeypatch.setattr(type(spanish.parser), "get_readings", fake_readings)
+    terms = Term.create_terms_no_parsing(spanish, ["Gato", "perro"])
+    assert [(t.text, t.text_lc, t.romanization) for t in terms] == [
+        ("Gato", "gato", "r-Gato"),
+        ("perro", "perro", "r-perro"),
+    ]
+    assert calls == [["Gato", "perro"]]
@@ -4,6 +4,10 @@ Text tests.
 
 from datetime import datetime
 from lute.models.book import Book, Text
+from lute.db import db
+from lute.parse.space_delimited_parser import SpaceDelimitedParser
+from lute.read.render.service import Service as RenderService
+from tests.dbasserts import assert_sql_result
 
 
 def transform_sentence(s):
@@ -33,3 +37,72 @@ def test_sentence_lifecycle(english):
     assert len(t.sentences) == 1, "changed"
 
     assert transform_sentence(t.sentences[0]) == "/Tengo/ /un/ /coche/./", "changed"
+
+
+def _token_data(tokens):
+    return [(t.token, t.is_word, t.is_end_of_sentence, t.order) for t in tokens]
+
+
+def test_parsed_tokens_are_saved_with_text(english, app_context):
+    "Saved tokens are used if the text and language settings are unchanged."
+    b = Book("hola", english)
+    t = Text(b, "Tienes un perro. Un gato.")
+    db.session.add(b)
+    db.session.commit()
+    assert_sql_result(
+        "select TxTokensKey is not null from texts", ["1"], "tokens saved"
+    )
+
+    db.session.expire_all()
+    toks = t.get_parsed_tokens()
+    assert _token_data(toks) == _token_data(english.get_parsed_tokens(t.text))
+
+    english.regexp_split_sentences = "!"
+    toks = t.get_parsed_tokens()
+    assert not any(tok.is_end_of_sentence for tok in toks), "reparsed"
+
+
+def test_changing_text_changes_saved_tokens(english, app_context):
+    "The key includes the text."
+    b = Book("hola", english)
+    t = Text(b, "Tienes un perro.")
+    t.text = "Tengo un gato."
+    assert [tok.token for tok in t.get_parsed_tokens()][0:3] == ["Tengo", " ", "un"]
+
+
+def test_get_all_parsed_tokens_parses_and_saves_unparsed_texts(english, app_context):
+    "Texts with current saved tokens aren't reparsed."
+    b = Book("hola", english)
+    t1 = Text(b, "Tienes un perro.")
+    t2 = Text(b, "Un gato.", 2)
+    t2.text = "Tengo un gato."
+    assert t2.get_parsed_tokens() is not None
+
+    # pylint: disable=protected-access
+    t1._packed_tokens = None
+    all_tokens = Text.get_all_parsed_tokens([t1, t2])
+    assert [_token_data(toks) for toks in all_tokens] == [
+        _token_data(english.get_parsed_tokens(t.text)) for t in (t1, t2)
+    ]
+    assert t1._packed_tokens is not None, "saved"
+
+
+def test_double_spaced_text_saved_tokens_used_for_rendering(
+    english, app_context, monkeypatch
+):
+    "Saved tokens are for the text as rendered, so it isn't parsed again."
+    b = Book("hola", english)
+    t = Text(b, "Tienes  un   perro.")
+    calls = []
+    parse = SpaceDelimitedParser.get_parsed_tokens
+
+    def _counting_parse(parser, s, language):
+        calls.append(s)
+        return parse(parser, s, language)
+
+    monkeypatch.setattr(SpaceDelimitedParser, "get_parsed_tokens", _counting_parse)
+    textitems = RenderService(db.session).get_textitems(
+        t.text, english, tokens=t.get_parsed_tokens()
+    )
+    assert not calls, "not reparsed"
+    assert [ti.text for ti in textitems if ti.is_word] == ["Tienes", "un", "perro"]
@@ -2,6 +2,8 @@
 JapaneseParser tests.
 """
 
+from types import SimpleNamespace
+from lute.parse import mecab_parser
 from lute.parse.mecab_parser import JapaneseParser
 from lute.models.term import Term
 from lute.settings.current import current_settings
@@ -106,3 +108,55 @@ def test_reading_setting(app_context):
     for k, v in cases.items():
         current_settings["japanese_reading"] = k
         assert p.get_reading("強い") == v, k
+
+
+class FakeMeCab:
+    "Tracks instances created, instead of loading mecab."
+
+    created = 0
+
+    # Fake "-O yomi" readings.
+    readings = {"強い": "ツヨイ", "元気": "ゲンキ"}
+
+    def __init__(self, flags):
+        self.flags = flags
+        FakeMeCab.created += 1
+
+    def parse(self, text, as_nodes):  # pylint: disable=unused-argument
+        "Return fake nodes."
+        return [SimpleNamespace(feature=FakeMeCab.readings.get(text, text))]
+
+
+def test_mecab_instances_are_pooled_and_reused(monkeypatch):
+    "Only one MeCab is created for sequential calls with the same flags."
+    monkeypatch.setattr(mecab_parser, "MeCab", FakeMeCab)
+    FakeMeCab.created = 0
+    mecab_parser.clear_mecab_pool()
+    # pylint: disable=protected-access
+    with mecab_parser._pooled_mecab("-a") as nm1:
+        with mecab_parser._pooled_mecab("-a") as nm2:
+            assert nm1 is not nm2, "in-use MeCab not shared"
+    with mecab_parser._pooled_mecab("-a") as nm3:
+        assert nm3 in (nm1, nm2), "reused"
+    with mecab_parser._pooled_mecab("-b") as nm4:
+        assert nm4.flags == "-b"
+    assert FakeMeCab.created == 3
+
+    mecab_parser.clear_mecab_pool()
+    with mecab_parser._pooled_mecab("-a") as nm5:
+        assert nm5 not in (nm1, nm2), "pool cleared"
+    assert FakeMeCab.created == 4
+    mecab_parser.clear_mecab_pool()
+
+
+def test_get_readings_uses_one_mecab(app_context, monkeypatch):
+    "All readings are found with a single MeCab."
+    monkeypatch.setattr(mecab_parser, "MeCab", FakeMeCab)
+    FakeMeCab.created = 0
+    mecab_parser.clear_mecab_pool()
+    current_settings["japanese_reading"] = "hiragana"
+    p = JapaneseParser()
+    texts = ["強い", "元気", "ひらがな", "xyz"]
+    assert p.get_readings(texts) == ["つよい", "げんき", None, None]
+    assert FakeMeCab.created == 1
+    mecab_parser.clear_mecab_pool()
@@ -5,6 +5,7 @@ SpaceDelimitedParser tests.
 import sys
 import re
 import unicodedata
+from lute.parse import space_delimited_parser
 from lute.parse.space_delimited_parser import SpaceDelimitedParser
 from lute.parse.base import ParsedToken
 
@@ -281,3 +282,76 @@ def test_all_chars_in_categories_match_default_word_chars():
         c = chr(i)
         if unicodedata.category(c) in categories:
             assert regex.match(c), f"Match for {c}"
+
+
+def test_blank_lines_and_trailing_newline(english):
+    "Each newline gets a paragraph marker."
+    assert_string_equals("Hi.\n\nThere.\n", english, "[Hi].¶¶[There].¶")
+
+
+def test_paragraphs_split_if_word_characters_include_newline(english):
+    "Words can't span paragraphs, even if newline is a word character."
+    english.word_characters = "a-zA-Z\\n"
+    assert_string_equals("Hi\nthere.", english, "[Hi]¶[there].")
+
+
+def test_changed_language_settings_are_used(english):
+    "The tokenizer for the old settings isn't reused."
+    assert_string_equals("Hi-there.", english, "[Hi]-[there].")
+    english.word_characters = "a-zA-Z-"
+    assert_string_equals("Hi-there.", english, "[Hi-there].")
+
+
+def test_word_characters_cache_dir_is_in_data_folder(
+    app, testconfig
+):  # pylint: disable=unused-argument
+    "Tests and the app don't write to the user's cache dir."
+    cache_dir = space_delimited_parser.WORD_CHARACTERS_CACHE_DIR
+    assert cache_dir == testconfig.cachepath
+    assert cache_dir.startswith(testconfig.datapath)
+
+
+def test_default_word_characters_saved_in_cache_dir(tmp_path, monkeypatch):
+    "The calculated characters are saved, and read the next time."
+    monkeypatch.setattr(
+        "lute.parse.space_delimited_parser.WORD_CHARACTERS_CACHE_DIR", str(tmp_path)
+    )
+    get_chars = SpaceDelimitedParser.get_default_word_characters
+    try:
+        get_chars.cache_clear()
+        calculated = get_chars()
+        files = list(tmp_path.iterdir())
+        assert len(files) == 1
+        assert unicodedata.unidata_version in files[0].name
+        assert files[0].read_text(encoding="utf-8") == calculated
+
+        files[0].write_text("a-z", encoding="utf-8")
+        get_chars.cache_clear()
+        assert get_chars() == "a-z", "read from file"
+    finally:
+        get_chars.cache_clear()
+
+
+def test_default_word_characters_cache_keyed_by_categories(tmp_path, monkeypatch):
+    "A file saved for other word categories isn't used."
+    monkeypatch.setattr(
+        "lute.parse.space_delimited_parser.WORD_CHARACTERS_CACHE_DIR", str(tmp_path)
+    )
+    get_chars = SpaceDelimitedParser.get_default_word_characters
+    try:
+        get_chars.cache_clear()
+        get_chars()
+        [saved] = list(tmp_path.iterdir())
+        saved.write_text("a-z", encoding="utf-8")
+
+        monkeypatch.setattr(
+            "lute.parse.space_delimited_parser.WORD_CHARACTER_CATEGORIES", {"Ll"}
+        )
+        get_chars.cache_clear()
+        lowercase = get_chars()
+        assert lowercase != "a-z", "recalculated"
+        assert len(list(tmp_path.iterdir())) == 2, "saved separately"
+        assert re.fullmatch(f"[{lowercase}]", "a")
+        assert not re.fullmatch(f"[{lowercase}]", "A")
+    finally:
+        get_chars.cache_clear()
@@ -0,0 +1,33 @@
+"""
+Packed token tests.
+"""
+
+from lute.models.language import Language
+from lute.parse import packed_tokens
+
+
+def _token_data(tokens):
+    return [
+        (t.token, t.is_word, t.is_end_of_sentence, t.order, t.sentence_number)
+        for t in tokens
+    ]
+
+
+def test_pack_and_unpack():
+    "Unpacked tokens are the same as the originals."
+    lang = Language()
+    lang.name = "Packed"
+    toks = lang.get_parsed_tokens("Hi there.  Ünïcode {braces}!\nNew para.")
+    unpacked = packed_tokens.unpack(packed_tokens.pack(toks))
+    assert _token_data(unpacked) == _token_data(toks)
+
+
+def test_key_changes_with_text_and_settings():
+    "Saved tokens for other text or settings aren't valid."
+    lang = Language()
+    lang.name = "Packed"
+    k = packed_tokens.key("Hi there.", lang)
+    assert k == packed_tokens.key("Hi there.", lang)
+    assert k != packed_tokens.key("Hi there!", lang)
+    lang.word_characters = "a-z"
+    assert k != packed_tokens.key("Hi there.", lang)
@@ -0,0 +1,94 @@
+"""
+Parallel parsing tests.
+"""
+
+# pylint: disable=protected-access
+
+from types import SimpleNamespace
+from lute.parse import parallel
+from lute.parse.space_delimited_parser import SpaceDelimitedParser
+
+
+class ProcessSafeParser(SpaceDelimitedParser):
+    "Space delimited parser that can be used in the pool."
+
+    @classmethod
+    def is_process_safe(cls):
+        return True
+
+
+def _token_data(tokens):
+    return [
+        (t.token, t.is_word, t.is_end_of_sentence, t.order, t.sentence_number)
+        for t in tokens
+    ]
+
+
+def _texts():
+    "Texts with paragraphs, blank lines, and odd spacing."
+    para = "Tengo un gato.  Tienes un perro?\n"
+    return [
+        para * 20,
+        "  " + para * 5 + "\n\n" + " ¡Hola!\n" + para * 5 + "\n",
+        "",
+        "Sin salto de línea.",
+    ]
+
+
+def test_split_pieces_only_breaks_between_non_space_chars():
+    "Pieces break after newlines with text on both sides."
+    s = "a\nb \nc\n d\n\ne\r\nf\ng"
+    pieces = parallel.split_pieces(s, 1)
+    assert pieces == ["a\n", "b \nc\n d\n\ne\r\nf\n", "g"]
+    assert "".join(parallel.split_pieces(s, 5)) == s
+    assert parallel.split_pieces("abc", 1) == ["abc"]
+
+
+def test_parse_all_in_process_same_as_language_parse(spanish):
+    "Parsers that aren't process safe are used in the current process."
+    texts = _texts()
+    assert parallel._worker_count(spanish.parser, texts * 10000) == 0
+    expected = [_token_data(spanish.get_parsed_tokens(s)) for s in texts]
+    assert [_token_data(t) for t in parallel.parse_all(spanish, texts)] == expected
+
+
+def test_parse_all_in_pool_same_as_language_parse(spanish, monkeypatch):
+    "Pieces parsed in the pool are joined back into the texts' tokens."
+    monkeypatch.setattr(parallel, "MIN_CHARS", 100)
+    monkeypatch.setattr(parallel, "PIECE_CHARS", 100)
+    monkeypatch.setattr(parallel, "MAX_WORKERS", 2)
+    pool_calls = []
+    parse_in_pool = parallel._parse_in_pool
+
+    def _spy(*args):
+        ret = parse_in_pool(*args)
+        pool_calls.append(args)
+        return ret
+
+    monkeypatch.setattr(parallel, "_parse_in_pool", _spy)
+
+    settings = {f: getattr(spanish, f) for f in parallel._LANGUAGE_FIELDS}
+    lang = SimpleNamespace(parser=ProcessSafeParser(), **settings)
+    texts = _texts()
+    expected = [_token_data(spanish.get_parsed_tokens(s)) for s in texts]
+    assert [_token_data(t) for t in parallel.parse_all(lang, texts)] == expected
+    assert len(pool_calls) == 1, "parsed in pool"
+
+
+def test_parse_all_without_pool_parses_in_process(spanish, monkeypatch):
+    "use_pool=False never starts the pool."
+    monkeypatch.setattr(parallel, "MIN_CHARS", 100)
+    monkeypatch.setattr(parallel, "PIECE_CHARS", 100)
+    monkeypatch.setattr(parallel, "MAX_WORKERS", 2)
+
+    def _no_pool(*args):
+        raise AssertionError("process pool used")
+
+    monkeypatch.setattr(parallel, "_parse_in_pool", _no_pool)
+
+    settings = {f: getattr(spanish, f) for f in parallel._LANGUAGE_FIELDS}
+    lang = SimpleNamespace(parser=ProcessSafeParser(), **settings)
+    texts = _texts()
+    expected = [_token_data(spanish.get_parsed_tokens(s)) for s in texts]
+    actual = parallel.parse_all(lang, texts, use_pool=False)
+    assert [_token_data(t) for t in actual] == expected
@@ -0,0 +1,72 @@
+"""
+Parse cache tests.
+"""
+
+import pytest
+from lute.models.language import Language
+from lute.parse import parse_cache
+
+
+@pytest.fixture(name="_clear_cache")
+def fixture_clear_cache():
+    "Start and end with an empty cache."
+    parse_cache.clear()
+    yield
+    parse_cache.clear()
+
+
+def _page(n=0):
+    "A string long enough to be cached."
+    return f"Page {n}. " + "Here is some text for the page.  " * 10
+
+
+def test_same_text_and_settings_only_parsed_once(_clear_cache):
+    "Cached tokens are returned."
+    lang = Language()
+    lang.name = "Cached"
+    t1 = lang.get_parsed_tokens(_page())
+    t2 = lang.get_parsed_tokens(_page())
+    assert isinstance(t1, tuple)
+    assert t1 is t2
+    assert [t.order for t in t1][0:3] == [1, 2, 3], "numbered"
+
+
+def test_changed_settings_reparse(_clear_cache):
+    "Settings are part of the key."
+    lang = Language()
+    lang.name = "Cached"
+    t1 = lang.get_parsed_tokens(_page())
+    lang.regexp_split_sentences = "!"
+    t2 = lang.get_parsed_tokens(_page())
+    assert t1 is not t2
+    assert sum(t.is_end_of_sentence for t in t2) < sum(
+        t.is_end_of_sentence for t in t1
+    ), "period no longer ends sentences"
+
+
+def test_short_strings_not_cached(_clear_cache):
+    "E.g. terms aren't cached."
+    lang = Language()
+    lang.name = "Cached"
+    assert lang.get_parsed_tokens("a cat") is not lang.get_parsed_tokens("a cat")
+
+
+def test_cache_is_bounded(_clear_cache):
+    "Least recently used entries are removed."
+    lang = Language()
+    lang.name = "Cached"
+    first = lang.get_parsed_tokens(_page(0))
+    for i in range(1, parse_cache.MAX_ENTRIES + 1):
+        lang.get_parsed_tokens(_page(i))
+    assert lang.get_parsed_tokens(_page(0)) is not first
+
+
+def test_changed_parser_data_version_reparses(_clear_cache, monkeypatch):
+    "E.g. a parser's exceptions file was edited."
+    lang = Language()
+    lang.name = "Cached"
+    t1 = lang.get_parsed_tokens(_page())
+    monkeypatch.setattr(
+        type(lang.parser), "data_version", classmethod(lambda cls: "v2")
+    )
+    assert lang.get_parsed_tokens(_page()) is not t1
@@ -0,0 +1,65 @@
+"""
+Parser warm-up tests.
+"""
+
+from lute.parse import warm_up
+
+
+class FastParser:
+    "Fake parser class."
+
+    warmed = False
+
+    @classmethod
+    def name(cls):
+        return "Fast"
+
+    @classmethod
+    def warm_up(cls):
+        cls.warmed = True
+
+
+class BrokenParser:
+    "Fake parser class that fails to warm up."
+
+    @classmethod
+    def name(cls):
+        return "Broken"
+
+    @classmethod
+    def warm_up(cls):
+        raise RuntimeError("no model")
+
+
+def test_used_parsers_warmed_up_in_background(monkeypatch):
+    "Status and timing is reported for each parser."
+    parsers = [("fast", FastParser), ("broken", BrokenParser), ("unused", FastParser)]
+    monkeypatch.setattr(warm_up, "supported_parsers", lambda: parsers)
+    monkeypatch.setattr(warm_up, "_status", {})
+    messages = []
+    thread = warm_up.start({"fast", "broken", "unknown"}, messages.append)
+    thread.join()
+
+    assert FastParser.warmed
+    assert warm_up.all_ready()
+    status = {s["parser_type"]: s for s in warm_up.status()}
+    assert list(status.keys()) == ["broken", "fast"]
+    assert status["fast"]["state"] == warm_up.READY
+    assert status["fast"]["ms"] is not None
+    assert status["broken"]["state"] == warm_up.FAILED
+    assert status["broken"]["error"] == "no model"
+    assert "Warm up of parser Broken failed: no model" in messages
+
+
+def test_not_ready_until_warmed_up(monkeypatch):
+    "Waiting parsers aren't ready."
+    monkeypatch.setattr(
+        warm_up, "_status", {"x": {"name": "X", "state": warm_up.WAITING}}
+    )
+    assert not warm_up.all_ready()
+
+
+def test_parser_status_route(client):
+    "Status is available as json."
+    response = client.get("/parser_status")
+    assert set(response.json.keys()) == {"ready", "parsers"}
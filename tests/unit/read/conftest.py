@@ -0,0 +1,28 @@
+"""
+Read test fixtures.
+"""
+
+import pytest
+
+
+class RenderCounter:
+    "Fake page renderer, counts the pages rendered."
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, paragraphs):  # pylint: disable=unused-argument
+        self.count += 1
+        return f"render {self.count}"
+
+
+@pytest.fixture(name="render")
+def fixture_render():
+    "Fake renderer for Service.get_page_content()."
+    return RenderCounter()
+
+
+@pytest.fixture(name="bg_render")
+def fixture_bg_render():
+    "Fake renderer for the background pre-renderer."
+    return RenderCounter()
@@ -2,9 +2,12 @@
 Tests for getting TextItems.
 """
 
+import random
+from collections import Counter
 from lute.models.term import Term
 from lute.parse.base import ParsedToken
-from lute.read.render.calculate_textitems import get_textitems
+from lute.read.render.calculate_textitems import get_textitems, _set_display_counts
+from lute.read.render.text_item import TextItem
 
 
 def make_tokens(token_data):
@@ -166,3 +169,39 @@ def test_crazy_case(english):
     expected = "[A-1][ -1][B C-3][C D E-5][E F G H I-9]"
     expected_displayed = "[A-1][ -1][B C-3][ D E-5][ F G H I-9]"
     assert_renderable_equals(english, data, words, expected, expected_displayed)
+
+
+def _old_display_counts(textitems, token_count):
+    "The original get_textitems display_count calculation, for comparison."
+    output_textitem_ids = [None] * token_count
+    for ti in reversed(textitems):
+        for c in range(ti.index, ti.index + ti.token_count):
+            output_textitem_ids[c] = id(ti)
+    id_counts = dict(Counter(output_textitem_ids))
+    return [id_counts.get(id(ti), 0) for ti in textitems]
+
+
+def _random_textitems(rnd, token_count):
+    "One textitem per token, plus random multiword textitems, sorted."
+    spans = [(i, 1) for i in range(token_count)]
+    for _ in range(rnd.randint(0, token_count)):
+        index = rnd.randrange(token_count)
+        spans.append((index, rnd.randint(2, min(6, token_count - index + 1))))
+    textitems = []
+    for index, count in spans:
+        ti = TextItem()
+        ti.index = index
+        ti.token_count = min(count, token_count - index)
+        textitems.append(ti)
+    return sorted(textitems, key=lambda x: (x.index, -x.token_count))
+
+
+def test_display_counts_match_original_algorithm():
+    "Random term layouts give the same display counts as the original code."
+    rnd = random.Random(42)
+    for _ in range(500):
+        token_count = rnd.randint(1, 40)
+        textitems = _random_textitems(rnd, token_count)
+        expected = _old_display_counts(textitems, token_count)
+        _set_display_counts(textitems)
+        assert [ti.display_count for ti in textitems] == expected
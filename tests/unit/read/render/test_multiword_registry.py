@@ -0,0 +1,83 @@
+"""
+Multiword indexer registry tests.
+"""
+
+from sqlalchemy import text as sqltext
+from lute.db import db
+from lute.models.term import Term
+from lute.read.render import multiword_registry
+from lute.term.model import Repository
+
+from tests.utils import add_terms
+
+
+def _found(language, tokens):
+    "Search the language's shared indexer."
+    mw = multiword_registry.get_indexer(db.session, language)
+    return list(mw.search_all(tokens))
+
+
+def test_indexer_is_only_built_once(spanish, app_context):
+    "Same indexer is returned for the language."
+    a = multiword_registry.get_indexer(db.session, spanish)
+    b = multiword_registry.get_indexer(db.session, spanish)
+    assert a is b
+
+
+def test_saved_terms_are_added_to_index(spanish, app_context):
+    "Multiword terms are added on commit."
+    zws = "\u200B"  # zero-width space
+    toks = ["un", " ", "gato"]
+    assert not _found(spanish, toks), "sanity check, no terms yet"
+
+    add_terms(spanish, ["un gato", "gato"])
+    assert _found(spanish, toks) == [(f"un{zws} {zws}gato", 0)]
+
+
+def test_uncommitted_terms_are_not_added(spanish, app_context):
+    "Rolled-back terms are not added."
+    toks = ["un", " ", "gato"]
+    _found(spanish, toks)  # Ensure the index is loaded.
+
+    db.session.add(Term(spanish, "un gato"))
+    db.session.flush()
+    db.session.rollback()
+    assert not _found(spanish, toks)
+
+
+def test_deleted_terms_are_removed_from_index(spanish, app_context):
+    "Deleting terms removes them from the index."
+    toks = ["un", " ", "gato"]
+    add_terms(spanish, ["un gato"])
+    assert len(_found(spanish, toks)) == 1, "found"
+
+    repo = Repository(db.session)
+    repo.delete(repo.find(spanish.id, "un gato"))
+    repo.commit()
+    assert not _found(spanish, toks), "deleted"
+
+
+def test_deleting_language_invalidates_index(spanish, app_context):
+    "Terms are deleted by cascade, so the whole index is dropped."
+    add_terms(spanish, ["un gato"])
+    langid = spanish.id
+    multiword_registry.get_indexer(db.session, spanish)
+    indexers = multiword_registry._indexers  # pylint: disable=protected-access
+    assert langid in indexers, "loaded"
+    db.session.delete(spanish)
+    db.session.commit()
+    assert langid not in indexers, "dropped"
+
+
+def test_raw_sql_changes_need_invalidation(spanish, app_context):
+    "Changes outside of the ORM aren't seen until invalidate."
+    toks = ["un", " ", "gato"]
+    add_terms(spanish, ["un gato"])
+    assert len(_found(spanish, toks)) == 1, "found"
+
+    db.session.execute(sqltext("delete from words"))
+    db.session.commit()
+    assert len(_found(spanish, toks)) == 1, "still in index"
+
+    multiword_registry.invalidate(spanish.id)
+    assert not _found(spanish, toks), "reloaded"
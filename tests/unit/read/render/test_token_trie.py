@@ -0,0 +1,92 @@
+"""
+TokenTrieIndexer tests.
+"""
+
+import random
+import pytest
+from lute.read.render.calculate_textitems import get_string_indexes
+from lute.read.render.token_trie import TokenTrieIndexer, get_token_indexes
+
+zws = "\u200B"  # zero-width space
+
+
+@pytest.mark.parametrize(
+    "name,terms,tokens,expected",
+    [
+        ("no terms", [], ["a"], []),
+        ("no tokens", ["a"], [], []),
+        ("no match", ["x"], ["a"], []),
+        ("partial token no match", ["a"], ["ab"], []),
+        ("single match", ["a"], ["b", "a"], [("a", 1)]),
+        ("same term twice", ["a"], ["b", "a", "c", "a"], [("a", 1), ("a", 3)]),
+        ("multi-word term", [f"a{zws}b"], ["b", "a", "b", "a"], [(f"a{zws}b", 1)]),
+        ("incomplete at end", [f"a{zws}b"], ["b", "a"], []),
+        (
+            "repeated m-word term",
+            [f"a{zws}a"],
+            ["a", "a", "a", "b"],
+            [(f"a{zws}a", 0), (f"a{zws}a", 1)],
+        ),
+        (
+            "nested terms same start",
+            [f"a{zws}b", f"a{zws}b{zws}c"],
+            ["a", "b", "c"],
+            [(f"a{zws}b", 0), (f"a{zws}b{zws}c", 0)],
+        ),
+    ],
+)
+def test_scenario(name, terms, tokens, expected):
+    "Test scenario."
+    trie = TokenTrieIndexer()
+    for t in terms:
+        trie.add(t)
+    assert list(trie.search_all(tokens)) == expected, name
+    assert get_token_indexes(terms, tokens) == expected, name
+
+
+def test_can_add_and_remove_terms_after_searching():
+    "Terms changed after a search are found (or not) in the next search."
+    trie = TokenTrieIndexer()
+    trie.add("a")
+    assert list(trie.search_all(["a", "b"])) == [("a", 0)]
+
+    trie.add("b")
+    assert list(trie.search_all(["a", "b"])) == [("a", 0), ("b", 1)]
+
+    trie.remove("a")
+    assert list(trie.search_all(["a", "b"])) == [("b", 1)]
+    assert "a" not in trie
+    assert len(trie) == 1
+
+
+def test_remove_prunes_only_removed_term():
+    "Removing a term leaves its prefix terms."
+    trie = TokenTrieIndexer()
+    trie.add(f"a{zws}b")
+    trie.add(f"a{zws}b{zws}c")
+    assert len(trie) == 2
+
+    trie.remove(f"a{zws}b{zws}c")
+    assert list(trie.search_all(["a", "b", "c"])) == [(f"a{zws}b", 0)]
+    assert f"a{zws}b{zws}c" not in trie
+    assert len(trie) == 1
+
+    trie.remove(f"a{zws}b")
+    assert not trie.root, "all nodes pruned"
+    trie.remove("not_there")
+    assert len(trie) == 0
+
+
+def test_matches_string_search_on_random_data():
+    "Same results as the zws-string search."
+    rnd = random.Random(7)
+    vocab = ["a", "b", "c", " "]
+    tokens = [rnd.choice(vocab) for _ in range(300)]
+    trie = TokenTrieIndexer()
+    terms = set()
+    for _ in range(40):
+        t = zws.join(rnd.choice(vocab) for _ in range(rnd.randint(1, 4)))
+        trie.add(t)
+        terms.add(t)
+    expected = get_string_indexes(terms, zws.join(tokens))
+    assert sorted(trie.search_all(tokens)) == sorted(expected)
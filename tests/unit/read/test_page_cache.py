@@ -0,0 +1,105 @@
+"""
+Page content cache tests.
+"""
+
+import pytest
+from lute.models.term import Term
+from lute.read.service import Service
+from lute.read import page_cache
+from lute.db import db
+
+from tests.dbasserts import assert_record_count_equals
+from tests.utils import make_book
+
+
+@pytest.fixture(name="dbbook")
+def fixture_dbbook(english, app_context):
+    "Saved single page book."
+    b = make_book("blah", "Dog CAT dog cat.", english)
+    db.session.add(b)
+    db.session.commit()
+    return b
+
+
+def test_content_is_only_rendered_once(dbbook, render):
+    "Second open uses cached content."
+    svc = Service(db.session)
+    assert svc.get_page_content(dbbook, 1, False, render) == "render 1"
+    assert svc.get_page_content(dbbook, 1, False, render) == "render 1"
+    assert render.count == 1
+
+
+def test_page_open_still_tracked_if_cached(dbbook, render):
+    "Start date is set even if content cached."
+    svc = Service(db.session)
+    svc.get_page_content(dbbook, 1, False, render)
+
+    sql_text_started = "select * from texts where TxStartDate is not null"
+    assert_record_count_equals(sql_text_started, 0, "not started")
+    svc.get_page_content(dbbook, 1, True, render)
+    assert_record_count_equals(sql_text_started, 1, "started")
+    assert render.count == 1, "cached"
+
+
+def test_term_change_rerenders(dbbook, render):
+    "Saving a term in the language bumps the term generation."
+    svc = Service(db.session)
+    svc.get_page_content(dbbook, 1, False, render)
+
+    t = db.session.query(Term).filter(Term.text_lc == "dog").first()
+    t.status = 3
+    db.session.add(t)
+    db.session.commit()
+    assert svc.get_page_content(dbbook, 1, False, render) == "render 2"
+
+
+def test_term_in_other_language_does_not_rerender(dbbook, render, spanish):
+    "Generations are per-language."
+    svc = Service(db.session)
+    svc.get_page_content(dbbook, 1, False, render)
+
+    db.session.add(Term(spanish, "perro"))
+    db.session.commit()
+    svc.get_page_content(dbbook, 1, False, render)
+    assert render.count == 1
+
+
+def test_text_change_rerenders(dbbook, render):
+    "Changing the page text changes the cache key."
+    svc = Service(db.session)
+    svc.get_page_content(dbbook, 1, False, render)
+
+    tx = dbbook.texts[0]
+    tx.text = "Dog CAT dog cat extra."
+    db.session.add(tx)
+    db.session.commit()
+    assert svc.get_page_content(dbbook, 1, False, render) == "render 2"
+
+
+def test_invalidate_rerenders(dbbook, render):
+    "Invalidate clears everything."
+    svc = Service(db.session)
+    svc.get_page_content(dbbook, 1, False, render)
+    page_cache.invalidate()
+    assert svc.get_page_content(dbbook, 1, False, render) == "render 2"
+
+
+def test_term_saved_during_render_rerenders(dbbook, render, monkeypatch):
+    "Content rendered while a term is saved is cached as stale."
+    svc = Service(db.session)
+
+    # Save a term after the page's terms are loaded, as if saved from
+    # the term form while the page was being (pre-)rendered.
+    save_new_terms = svc._save_new_status_0_terms  # pylint: disable=protected-access
+
+    def _save_and_change_term(paragraphs):
+        save_new_terms(paragraphs)
+        t = db.session.query(Term).filter(Term.text_lc == "dog").first()
+        t.status = 3
+        db.session.add(t)
+        db.session.commit()
+
+    monkeypatch.setattr(svc, "_save_new_status_0_terms", _save_and_change_term)
+    svc.get_page_content(dbbook, 1, False, render)
+    monkeypatch.undo()
+    assert svc.get_page_content(dbbook, 1, False, render) == "render 2"
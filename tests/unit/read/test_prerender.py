@@ -0,0 +1,106 @@
+"""
+Background pre-rendering tests.
+"""
+
+import threading
+from lute.models.term import Term
+from lute.read.service import Service
+from lute.read import page_cache, prerender
+from lute.db import db
+
+from tests.utils import make_book
+
+
+def _make_book(language, pages):
+    "Make a saved book with the given page texts."
+    b = make_book("blah", pages, language)
+    db.session.add(b)
+    db.session.commit()
+    return b
+
+
+def _wait_for_worker():
+    "The single worker runs jobs in order, so wait for a no-op job."
+    # pylint: disable=protected-access
+    prerender._executor.submit(lambda: None).result()
+
+
+def test_next_pages_are_prerendered(app, english, app_context, render, bg_render):
+    "Following pages are cached, and aren't rendered again when opened."
+    dbbook = _make_book(english, ["Page one.", "Page two.", "Page three.", "Four."])
+    assert dbbook.page_count == 4, "sanity check"
+
+    prerender.schedule(app, dbbook, 1, 2, bg_render)
+    _wait_for_worker()
+    assert bg_render.count == 2, "pages 2 and 3"
+
+    svc = Service(db.session)
+    assert svc.get_page_content(dbbook, 2, True, render) == "render 1"
+    assert svc.get_page_content(dbbook, 3, True, render) == "render 2"
+    assert render.count == 0, "used prerendered"
+    svc.get_page_content(dbbook, 4, True, render)
+    assert render.count == 1, "page 4 not prerendered"
+
+
+def test_prerender_stops_at_last_page(app, english, app_context, bg_render):
+    "No error if there are no more pages."
+    dbbook = _make_book(english, ["Page one.", "Page two."])
+    prerender.schedule(app, dbbook, 2, 2, bg_render)
+    prerender.schedule(app, dbbook, 1, 2, bg_render)
+    _wait_for_worker()
+    assert bg_render.count == 1, "only page 2"
+
+
+def test_prerender_does_not_start_page(app, english, app_context, bg_render):
+    "The page start date isn't set by prerendering."
+    dbbook = _make_book(english, ["Page one.", "Page two."])
+    prerender.schedule(app, dbbook, 1, 2, bg_render)
+    _wait_for_worker()
+    db.session.expire_all()
+    assert dbbook.texts[1].start_date is None
+
+
+def test_term_saved_while_prerendering_rerenders(
+    app, english, app_context, render, bg_render
+):
+    "A page pre-rendered while a term is saved is stale when opened."
+    dbbook = _make_book(english, ["Page one.", "Dog cat."])
+    t = Term(english, "dog")
+    db.session.add(t)
+    db.session.commit()
+
+    rendering = threading.Event()
+    term_saved = threading.Event()
+
+    def _slow_render(paragraphs):
+        rendering.set()
+        assert term_saved.wait(10), "term saved"
+        return bg_render(paragraphs)
+
+    prerender.schedule(app, dbbook, 1, 1, _slow_render)
+    assert rendering.wait(10), "worker rendering"
+    t.status = 3
+    db.session.add(t)
+    db.session.commit()
+    term_saved.set()
+    _wait_for_worker()
+    assert bg_render.count == 1, "prerendered"
+
+    svc = Service(db.session)
+    assert svc.get_page_content(dbbook, 2, True, render) == "render 1"
+    assert render.count == 1, "rendered again"
+
+
+def test_start_reading_prerenders_next_page(
+    app, client, english, app_context, monkeypatch
+):
+    "With PRERENDER_PAGES set, opening a page caches the next one."
+    dbbook = _make_book(english, ["Page one.", "Page two.", "Page three."])
+    monkeypatch.setitem(app.config, "PRERENDER_PAGES", 1)
+    response = client.get(f"/read/start_reading/{dbbook.id}/1")
+    assert response.status_code == 200
+    _wait_for_worker()
+
+    texts = dbbook.texts
+    assert page_cache.get(texts[1]) is not None, "page 2 prerendered"
+    assert page_cache.get(texts[2]) is None, "page 3 not prerendered"
@@ -2,6 +2,8 @@
 Read service tests.
 """
 
+import pytest
+from sqlalchemy import event
 from lute.models.term import Term
 from lute.book.model import Book, Repository
 from lute.read.service import Service
@@ -65,9 +67,94 @@ def test_set_unknowns_to_known(english, app_context):
     db.session.commit()
 
     service = Service(db.session)
-    service.set_unknowns_to_known(tx)
+    assert service.set_unknowns_to_known(tx) == (1, 1), "created extra, updated cat"
     assert_sql_result(sql, ["cat; 99", "dog; 1", "extra; 99"], "after set")
 
+    assert service.set_unknowns_to_known(tx) == (0, 0), "nothing left"
+
+
+def test_set_unknowns_to_known_update_has_single_parameter(english, app_context):
+    "The unknown terms are passed to the update as one json string."
+    b = Book()
+    b.title = "blah"
+    b.language_id = english.id
+    b.text = " ".join(f"w{a}{c}" for a in "abcdefghij" for c in "abcdefghij") + "."
+    r = Repository(db.session)
+    dbbook = r.add(b)
+    r.commit()
+
+    service = Service(db.session)
+    service.start_reading(dbbook, 1)
+    assert_record_count_equals("select * from words where WoStatus = 0", 100, "new")
+
+    updates = []
+
+    def _collect(conn, cursor, statement, parameters, *args):
+        # pylint: disable=unused-argument
+        if statement.startswith("UPDATE words"):
+            updates.append(parameters)
+
+    event.listen(db.engine, "before_cursor_execute", _collect)
+    try:
+        assert service.set_unknowns_to_known(dbbook.texts[0]) == (0, 100)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _collect)
+
+    assert len(updates) == 1, "one update"
+    assert len(updates[0]) == 4, "status, lang, status, json"
+    assert_record_count_equals("select * from words where WoStatus = 99", 100, "set")
+
+
+def test_set_unknowns_to_known_only_changes_rendered_terms(english, app_context):
+    "Words hidden by a multiword term aren't changed."
+    t = Term(english, "big dog")
+    db.session.add(t)
+    db.session.commit()
+
+    b = Book()
+    b.title = "blah"
+    b.language_id = english.id
+    b.text = "A big dog."
+    r = Repository(db.session)
+    dbbook = r.add(b)
+    r.commit()
+
+    service = Service(db.session)
+    assert service.set_unknowns_to_known(dbbook.texts[0]) == (1, 0)
+    sql = "select WoTextLC, WoStatus from words order by WoText"
+    assert_sql_result(sql, ["a; 99", "big/ /dog; 1"], "after set")
+
+
+@pytest.mark.parametrize("insert_returning", [True, False])
+def test_new_status_0_terms_are_saved_with_ids(
+    insert_returning, english, app_context, monkeypatch
+):
+    "New terms are inserted, and the rendered terms get their ids."
+    monkeypatch.setattr("lute.read.service.INSERT_RETURNING", insert_returning)
+    b = Book()
+    b.title = "blah"
+    b.language_id = english.id
+    b.text = "Dog CAT dog cat."
+    r = Repository(db.session)
+    dbbook = r.add(b)
+    r.commit()
+
+    service = Service(db.session)
+    paras = service.start_reading(dbbook, 1)
+    word_tis = [ti for para in paras for sent in para for ti in sent if ti.is_word]
+    terms = list({ti.term.text_lc: ti.term for ti in word_tis}.values())
+    assert len(terms) == 2, "sanity check"
+
+    sql = "select WoID, WoTextLC, WoStatus, WoTokenCount from words order by WoTextLC"
+    expected = [
+        f"{t.id}; {t.text_lc}; 0; 1" for t in sorted(terms, key=lambda t: t.text_lc)
+    ]
+    assert_sql_result(sql, expected, "saved")
+
+    for t in terms:
+        assert t in db.session, "attached"
+        assert db.session.get(Term, t.id) is t, "same instance"
+
 
 def test_smoke_start_reading(english, app_context):
     "Smoke test book."
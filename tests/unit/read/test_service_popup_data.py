@@ -2,7 +2,9 @@
 Term popup data tests.
 """
 
+from contextlib import contextmanager
 import pytest
+from sqlalchemy import event
 from lute.models.term import Term, TermTag, Status
 from lute.models.repositories import UserSettingRepository
 from lute.read.service import Service
@@ -361,3 +363,51 @@ def test_components_only_returned_once(spanish, app_context, service):
 
     d = service.get_popup_data(t.id)
     assert_components(d, ["gato; cat"], "components")
+
+
+@contextmanager
+def _count_queries():
+    "Collect the sql statements executed in the block."
+    statements = []
+
+    def _collect(conn, cursor, statement, *args):  # pylint: disable=unused-argument
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _collect)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _collect)
+
+
+def _popup_query_count(spanish, service, prefix, component_count):
+    "Query count for a popup of a term with components with parents, tags, etc."
+    words = [f"{prefix}{chr(ord('a') + i)}" for i in range(component_count)]
+    t = Term(spanish, " ".join(words))
+    t.translation = "x"
+    db.session.add(t)
+    for w in words:
+        c = Term(spanish, w)
+        c.translation = f"{w} translation"
+        c.add_term_tag(TermTag(f"{w} tag"))
+        c.set_flash_message("flash")
+        p = Term(spanish, f"{w} parent")
+        p.translation = "parent translation"
+        c.parents.append(p)
+        db.session.add(c)
+    db.session.commit()
+    db.session.expire_all()
+
+    with _count_queries() as statements:
+        d = service.get_popup_data(t.id)
+    assert len(d.components) == component_count, "sanity check"
+    return len(statements)
+
+
+def test_popup_query_count_does_not_depend_on_components(spanish, app_context, service):
+    "Component relationships are eager loaded, not loaded per component (N+1)."
+    # Load caches (e.g. the multiword index) before counting.
+    _popup_query_count(spanish, service, "cero", 2)
+    few = _popup_query_count(spanish, service, "uno", 2)
+    many = _popup_query_count(spanish, service, "dos", 8)
+    assert many == few
@@ -0,0 +1,42 @@
+"""
+Term import service tests.
+"""
+
+from lute.db import db
+from lute.models.term import Term
+from lute.parse.space_delimited_parser import SpaceDelimitedParser
+from lute.termimport.service import Service
+
+
+class ReadingCounter:
+    "Fake get_reading, counts calls."
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, text):
+        self.count += 1
+        return f"reading of {text}"
+
+
+def _import(tmp_path, content):
+    "Import the csv content."
+    csv = tmp_path / "import.csv"
+    csv.write_text(content, encoding="utf-8")
+    return Service(db.session).import_file(str(csv))
+
+
+def test_import_does_not_get_readings(english, app_context, tmp_path, monkeypatch):
+    "Terms without a pronunciation in the file don't get a reading."
+    counter = ReadingCounter()
+    monkeypatch.setattr(SpaceDelimitedParser, "get_reading", counter)
+    content = f"language,term\n{english.name},cat\n{english.name},dog\n"
+    stats = _import(tmp_path, content)
+    assert stats["created"] == 2
+    assert counter.count == 0
+
+    terms = db.session.query(Term).order_by(Term.text_lc).all()
+    assert [(t.text, t.romanization) for t in terms] == [
+        ("cat", None),
+        ("dog", None),
+    ]
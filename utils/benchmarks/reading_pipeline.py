@@ -0,0 +1,287 @@
+"""
+Benchmark: the reading pipeline, with a large synthetic vocabulary.
+
+Creates a throwaway data directory and db, with a synthetic
+space-delimited language, 50k single-word terms, 20k multiword terms,
+and a 500-page book, and then times:
+
+- parsing pages (SpaceDelimitedParser)
+- term lookup for a page (RenderService._find_all_terms_in_tokens)
+- overlap resolution (calculate_textitems.get_textitems)
+- book stats (stats Service.calc_status_distribution)
+- book import (book Repository.add)
+- term csv import (termimport Service.import_file)
+
+Results are written as json, so runs can be compared across releases.
+
+Usage:
+
+python -m utils.benchmarks.reading_pipeline [--output results.json]
+
+Run with --help for the sizing options.
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from flask import current_app
+from sqlalchemy import insert
+
+import lute
+from lute.app_factory import create_app
+from lute.book.model import Book, Repository
+from lute.book.stats import Service as StatsService
+from lute.db import db
+from lute.models.language import Language
+from lute.models.term import Term
+from lute.read.render.calculate_textitems import get_textitems
+from lute.read.render.service import Service as RenderService
+from lute.termimport.service import Service as TermImportService
+
+zws = "\u200B"  # zero-width space
+
+
+def _make_vocab(count, rnd):
+    "Unique lowercase words."
+    words = set()
+    while len(words) < count:
+        n = rnd.randint(3, 10)
+        words.add("".join(rnd.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(n)))
+    return sorted(words)
+
+
+def _make_page(vocab, word_count, rnd):
+    "Paragraphs of sentences of random vocab words."
+    sentences = []
+    while word_count > 0:
+        n = min(word_count, rnd.randint(5, 15))
+        sentence = " ".join(rnd.choice(vocab) for _ in range(n))
+        sentences.append(sentence.capitalize() + ".")
+        word_count -= n
+    paras = [" ".join(sentences[i : i + 4]) for i in range(0, len(sentences), 4)]
+    return "\n".join(paras)
+
+
+def _create_data_dir():
+    "Temp data dir with a config file, returns the config file path."
+    datapath = tempfile.mkdtemp(prefix="lute_bench_")
+    config_file = os.path.join(datapath, "config.yml")
+    with open(config_file, "w", encoding="utf-8") as f:
+        f.write(f"ENV: dev\nDATAPATH: {datapath}\nDBNAME: bench.db\n")
+    return config_file
+
+
+def _create_language():
+    "Saved space-delimited language."
+    lang = Language()
+    lang.name = "Bench"
+    lang.word_characters = "a-zA-Z"
+    db.session.add(lang)
+    db.session.commit()
+    return lang
+
+
+def _create_terms(lang, vocab, single_count, multi_count, rnd):
+    "Bulk-insert the terms, returns the multiword term strings."
+    rows = [
+        {
+            "language_id": lang.id,
+            "_text": w,
+            "text_lc": w,
+            "status": rnd.randint(1, 5),
+            "token_count": 1,
+        }
+        for w in vocab[:single_count]
+    ]
+
+    mwords = set()
+    while len(mwords) < multi_count:
+        words = [rnd.choice(vocab) for _ in range(rnd.randint(2, 3))]
+        mwords.add(f"{zws} {zws}".join(words))
+    rows += [
+        {
+            "language_id": lang.id,
+            "_text": m,
+            "text_lc": m,
+            "status": rnd.randint(1, 5),
+            "token_count": 2 * m.count(" ") + 1,
+        }
+        for m in mwords
+    ]
+
+    db.session.execute(insert(Term), rows)
+    db.session.commit()
+    return sorted(mwords)
+
+
+def _create_book(lang, title, pages):
+    "Import book, returns the db book."
+    b = Book()
+    b.title = title
+    b.language_id = lang.id
+    b.text = "\n---\n".join(pages)
+    r = Repository(db.session)
+    dbbook = r.add(b)
+    r.commit()
+    return dbbook
+
+
+def _write_term_csv(filename, lang, vocab, count):
+    "Csv of new terms (not in the db) with translations."
+    with open(filename, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["language", "term", "translation", "status"])
+        for w in vocab[-count:]:
+            writer.writerow([lang.name, w, f"translation of {w}", "1"])
+
+
+def _time(func, runs):
+    "Run func runs times, returns timings in ms."
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return {
+        "runs": runs,
+        "mean_ms": round(sum(times) / runs, 3),
+        "min_ms": round(min(times), 3),
+        "max_ms": round(max(times), 3),
+    }
+
+
+def _run_benchmarks(args, log):  # pylint: disable=too-many-locals
+    "Create data, run all benchmarks, return results dict."
+    rnd = random.Random(args.seed)
+    results = {}
+
+    # Vocab has more words than terms, so pages have unknown words.
+    vocab = _make_vocab(int(args.terms * 1.2) + args.csv_terms, rnd)
+    page_vocab = vocab[: -args.csv_terms]
+    pages = [
+        _make_page(page_vocab, args.words_per_page, rnd) for _ in range(args.pages)
+    ]
+
+    log("Creating language and terms ...")
+    lang = _create_language()
+    mwords = _create_terms(lang, vocab, args.terms, args.multiword_terms, rnd)
+
+    # Add some multiwords to each page so they're found.
+    pages = [p + " " + rnd.choice(mwords).replace(zws, "") + "." for p in pages]
+
+    log(f"Importing {args.pages}-page book ...")
+    books = []
+    results["book_import"] = _time(
+        lambda: books.append(_create_book(lang, "Bench", pages)), 1
+    )
+    dbbook = books[0]
+
+    sample = [tx.text for tx in dbbook.texts[: args.sample_pages]]
+    svc = RenderService(db.session)
+    mw_indexer = svc.get_multiword_indexer(lang)
+
+    log("Parsing ...")
+
+    def parse_all():
+        for tx in dbbook.texts:
+            lang.get_parsed_tokens(tx.text)
+
+    results["parse_book"] = _time(parse_all, args.runs)
+
+    tokens = [lang.get_parsed_tokens(s) for s in sample]
+
+    def lookup():
+        # pylint: disable=protected-access
+        return [svc._find_all_terms_in_tokens(t, lang, mw_indexer) for t in tokens]
+
+    log("Term lookup ...")
+    results["term_lookup_per_page"] = _per_page(_time(lookup, args.runs), sample)
+
+    terms = lookup()
+
+    def textitems():
+        for toks, trms in zip(tokens, terms):
+            get_textitems(toks, trms, lang, mw_indexer)
+
+    log("Textitems ...")
+    results["get_textitems_per_page"] = _per_page(_time(textitems, args.runs), sample)
+
+    log("Status distribution ...")
+    stats_svc = StatsService(db.session)
+    results["calc_status_distribution"] = _time(
+        lambda: stats_svc.calc_status_distribution(dbbook), args.runs
+    )
+
+    log("Term csv import ...")
+    csv_file = os.path.join(current_app.env_config.temppath, "terms.csv")
+    _write_term_csv(csv_file, lang, vocab, args.csv_terms)
+    import_svc = TermImportService(db.session)
+    results["term_csv_import"] = _time(lambda: import_svc.import_file(csv_file), 1)
+
+    return results
+
+
+def _per_page(timings, sample):
+    "Convert timings for all sample pages to per-page timings."
+    n = len(sample)
+    ret = {k: (round(v / n, 3) if k.endswith("_ms") else v) for k, v in timings.items()}
+    ret["pages"] = n
+    return ret
+
+
+def main():
+    "Run the benchmarks, print or save json."
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--terms", type=int, default=50000, help="single-word terms")
+    parser.add_argument(
+        "--multiword-terms", type=int, default=20000, help="multiword terms"
+    )
+    parser.add_argument("--pages", type=int, default=500, help="book pages")
+    parser.add_argument("--words-per-page", type=int, default=200)
+    parser.add_argument(
+        "--sample-pages", type=int, default=20, help="pages for per-page timings"
+    )
+    parser.add_argument("--csv-terms", type=int, default=1000, help="terms in csv")
+    parser.add_argument("--runs", type=int, default=3, help="runs per benchmark")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="json file (default: stdout)")
+    args = parser.parse_args()
+
+    def log(s):
+        print(s, file=sys.stderr)
+
+    log("Creating db ...")
+    config_file = _create_data_dir()
+    try:
+        app = create_app(config_file)
+        with app.app_context():
+            results = _run_benchmarks(args, log)
+    finally:
+        shutil.rmtree(os.path.dirname(config_file))
+
+    report = {
+        "lute_version": lute.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": vars(args),
+        "results": results,
+    }
+    out = json.dumps(report, indent=2)
+    if args.output is None:
+        print(out)
+        return
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(out + "\n")
+    log(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: time and memory for calculating a page's TextItems.
+
+Parses a synthetic page, and runs calculate_textitems.get_textitems
+on it with some single and multiword terms, reporting the time per
+page and the peak memory allocated (tracemalloc) while doing so.
+
+No db is needed, the Language and Terms are never saved.
+
+Usage:
+
+python -m utils.benchmarks.render_memory [token_count]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+from lute.models.language import Language
+from lute.models.term import Term
+from lute.read.render.calculate_textitems import get_textitems
+from lute.read.render.token_trie import TokenTrieIndexer
+
+zws = "\u200B"  # zero-width space
+
+
+def _make_page(word_count, rnd):
+    "Sentences of words from a small vocabulary, so terms match often."
+    vocab = [
+        "".join(rnd.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(5))
+        for _ in range(300)
+    ]
+    words = [rnd.choice(vocab) for _ in range(word_count)]
+    sentences = [" ".join(words[i : i + 12]) + "." for i in range(0, len(words), 12)]
+    return vocab, " ".join(sentences)
+
+
+def _make_terms(language, vocab, rnd):
+    "Terms for half of the vocab, plus some two-word terms."
+    terms = [Term.create_term_no_parsing(language, w) for w in vocab[::2]]
+    pairs = {(rnd.choice(vocab), rnd.choice(vocab)) for _ in range(200)}
+    for a, b in pairs:
+        terms.append(Term.create_term_no_parsing(language, zws.join([a, " ", b])))
+    return terms
+
+
+def _render(language, text, terms):
+    "Parse and get textitems, as for a rendered page."
+    tokens = language.get_parsed_tokens(text)
+    indexer = TokenTrieIndexer()
+    for t in terms:
+        if t.token_count > 1:
+            indexer.add(t.text_lc)
+    textitems = get_textitems(tokens, terms, language, indexer)
+    for ti in textitems:
+        # Values used by the template.
+        _ = (ti.html_class_string, ti.html_display_text, ti.span_id)
+    return tokens, textitems
+
+
+def _instance_size(obj):
+    "Size of the object and its __dict__, if it has one."
+    ret = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        ret += sys.getsizeof(obj.__dict__)
+    return ret
+
+
+def main(word_count):
+    "Run the benchmark."
+    rnd = random.Random(42)
+    language = Language()
+    language.name = "Bench"
+    vocab, text = _make_page(word_count, rnd)
+    terms = _make_terms(language, vocab, rnd)
+
+    tokens, textitems = _render(language, text, terms)
+    print(f"{len(tokens)} tokens, {len(textitems)} textitems, {len(terms)} terms")
+    print(f"ParsedToken: {_instance_size(tokens[0])} bytes")
+    print(f"TextItem: {_instance_size(textitems[0])} bytes")
+
+    runs = 10
+    start = time.perf_counter()
+    for _ in range(runs):
+        _render(language, text, terms)
+    print(f"time per page: {(time.perf_counter() - start) / runs * 1000:.1f} ms")
+
+    tracemalloc.start()
+    _render(language, text, terms)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"peak memory per page: {peak / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1500)
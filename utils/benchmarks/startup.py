@@ -0,0 +1,61 @@
+"""
+Benchmark: cold-start parsing time.
+
+The first parse of a text in a language with blank word characters
+needs the default word characters.  Calculating them checks every
+unicode character, so they're saved in a cache dir (see
+SpaceDelimitedParser.get_default_word_characters).
+
+This runs fresh python processes to time the lute imports and the
+first parse, with an empty cache dir (cold) and then with the
+cached characters (warm).
+
+Usage:
+
+python -m utils.benchmarks.startup [runs]
+"""
+
+import subprocess
+import sys
+import tempfile
+
+# Run in the child process, with the cache dir as argv[1].
+_CHILD = """
+import sys, time
+start = time.perf_counter()
+from lute.models.language import Language
+from lute.parse import space_delimited_parser
+imported = time.perf_counter()
+space_delimited_parser.WORD_CHARACTERS_CACHE_DIR = sys.argv[1]
+lang = Language()
+lang.name = "Default"
+lang.word_characters = ""
+lang.get_parsed_tokens("Here is a page.")
+parsed = time.perf_counter()
+print(f"{(imported - start) * 1000:.1f} {(parsed - imported) * 1000:.1f}")
+"""
+
+
+def _run_child(cache_dir):
+    "Returns (import ms, first parse ms)."
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, cache_dir],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return [float(v) for v in out.stdout.split()]
+
+
+def main(runs):
+    "Run the benchmark."
+    print("            import ms  first parse ms")
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for label in ["cold", "warm"]:
+                import_ms, parse_ms = _run_child(cache_dir)
+                print(f"{label:10}  {import_ms:9.1f}  {parse_ms:14.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
@@ -0,0 +1,80 @@
+"""
+Micro-benchmark: mapping multiword match positions back to token indexes.
+
+Compares the old linear zwsindexes.index(charpos) lookup in
+get_string_indexes with its char offset => token index map, on a
+long synthetic chapter.
+
+Usage:
+
+python -m utils.benchmarks.string_indexes [token_count]
+"""
+
+import random
+import re
+import sys
+import time
+
+from lute.read.render.calculate_textitems import get_string_indexes
+
+zws = "\u200B"  # zero-width space
+
+
+def _make_chapter(token_count, rnd):
+    "Words separated by spaces, with a small vocabulary so terms match often."
+    vocab = [
+        "".join(rnd.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(4))
+        for _ in range(20)
+    ]
+    tokens = []
+    while len(tokens) < token_count:
+        tokens.extend([rnd.choice(vocab), " "])
+    return vocab, tokens
+
+
+def _make_terms(vocab, rnd, count):
+    "Two-word terms."
+    return list(
+        {zws.join([rnd.choice(vocab), " ", rnd.choice(vocab)]) for _ in range(count)}
+    )
+
+
+def _linear_get_string_indexes(strings, content):
+    "Old get_string_indexes mapping."
+    searchcontent = zws + content + zws
+    zwsindexes = [index for index, letter in enumerate(searchcontent) if letter == zws]
+    ret = []
+    for s in strings:
+        pattern = rf"(?=({re.escape(zws + s + zws)}))"
+        ret.extend(
+            (s, zwsindexes.index(m.start()))
+            for m in re.finditer(pattern, searchcontent)
+        )
+    return ret
+
+
+def _time(label, func):
+    "Time func, return result."
+    start = time.perf_counter()
+    ret = func()
+    print(f"  {label}: {time.perf_counter() - start:.4f}s")
+    return ret
+
+
+def main(token_count):
+    "Run the benchmark."
+    rnd = random.Random(42)
+    vocab, tokens = _make_chapter(token_count, rnd)
+    terms = _make_terms(vocab, rnd, 200)
+    content = zws.join(tokens)
+
+    print(f"{len(tokens)} tokens, {len(terms)} multiword terms")
+    print("get_string_indexes:")
+    old = _time("zwsindexes.index", lambda: _linear_get_string_indexes(terms, content))
+    new = _time("offset map", lambda: get_string_indexes(terms, content))
+    assert sorted(old) == sorted(new)
+    print(f"  ({len(new)} matches)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)